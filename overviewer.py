@@ -190,6 +190,7 @@ def main():
         if args.verbose > 0:
             print("Python executable: %r" % sys.executable)
             print(sys.version)
+            print(textures.pillow_version())
         if not args.checkversion:
             return 0
     if args.checkversion:
@@ -502,6 +503,7 @@ def main():
         if texopts_key not in texcache:
             tex = textures.Textures(**texopts)
             logging.info("Generating textures...")
+            logging.debug("Using %s.", textures.pillow_version())
             tex.generate()
             logging.debug("Finished generating textures.")
             texcache[texopts_key] = tex
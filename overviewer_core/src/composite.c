@@ -173,6 +173,9 @@ alpha_over_full(PyObject* dest, PyObject* src, PyObject* mask, float overall_alp
         return dest;
     }
 
+    /* the blend itself doesn't touch any python objects, so let other
+       threads run while it happens */
+    Py_BEGIN_ALLOW_THREADS
     for (y = 0; y < ysize; y++) {
         UINT8* out = (UINT8*)imDest->image[dy + y] + dx * 4;
         UINT8* outmask = (UINT8*)imDest->image[dy + y] + dx * 4 + 3;
@@ -225,6 +228,7 @@ alpha_over_full(PyObject* dest, PyObject* src, PyObject* mask, float overall_alp
             inmask += mask_stride;
         }
     }
+    Py_END_ALLOW_THREADS
 
     return dest;
 }
@@ -252,17 +256,21 @@ alpha_over_wrap(PyObject* self, PyObject* args) {
         ysize = 0;
         dx = 0;
         dy = 0;
+    } else if (PyTuple_Check(pos) && PyTuple_GET_SIZE(pos) == 2) {
+        /* a point, by far the most common case -- check for it first so
+           it doesn't pay for raising and clearing a failed rect parse */
+        xsize = 0;
+        ysize = 0;
+        if (!PyArg_ParseTuple(pos, "ii", &dx, &dy)) {
+            PyErr_SetString(PyExc_TypeError,
+                            "given blend destination rect is not valid");
+            return NULL;
+        }
     } else {
         if (!PyArg_ParseTuple(pos, "iiii", &dx, &dy, &xsize, &ysize)) {
-            /* try again, but this time try to read a point */
-            PyErr_Clear();
-            xsize = 0;
-            ysize = 0;
-            if (!PyArg_ParseTuple(pos, "ii", &dx, &dy)) {
-                PyErr_SetString(PyExc_TypeError,
-                                "given blend destination rect is not valid");
-                return NULL;
-            }
+            PyErr_SetString(PyExc_TypeError,
+                            "given blend destination rect is not valid");
+            return NULL;
         }
     }
 
@@ -23,7 +23,7 @@
 typedef struct {
     int32_t use_biomes;
     /* grasscolor and foliagecolor lookup tables */
-    PyObject *grasscolor, *foliagecolor, *watercolor;
+    PyArrayObject *grasscolor, *foliagecolor, *watercolor;
     /* biome-compatible grass/leaf textures */
     PyObject* grass_texture;
 } PrimitiveBase;
@@ -39,9 +39,9 @@ base_start(void* data, RenderState* state, PyObject* support) {
     self->grass_texture = PyObject_GetAttrString(state->textures, "biome_grass_texture");
 
     /* color lookup tables */
-    self->foliagecolor = PyObject_CallMethod(state->textures, "load_foliage_color", "");
-    self->grasscolor = PyObject_CallMethod(state->textures, "load_grass_color", "");
-    self->watercolor = PyObject_CallMethod(state->textures, "load_water_color", "");
+    self->foliagecolor = (PyArrayObject*)PyObject_CallMethod(state->textures, "load_foliage_color", "");
+    self->grasscolor = (PyArrayObject*)PyObject_CallMethod(state->textures, "load_grass_color", "");
+    self->watercolor = (PyArrayObject*)PyObject_CallMethod(state->textures, "load_water_color", "");
 
     return false;
 }
@@ -118,7 +118,7 @@ base_draw(void* data, RenderState* state, PyObject* src, PyObject* mask, PyObjec
         /* do the biome stuff! */
         PyObject* facemask = mask;
         uint8_t r = 255, g = 255, b = 255;
-        PyObject* color_table = NULL;
+        PyArrayObject* color_table = NULL;
         bool flip_xy = false;
 
         if (state->block == block_grass) {
@@ -142,7 +142,7 @@ base_draw(void* data, RenderState* state, PyObject* src, PyObject* mask, PyObjec
             float temp = 0.0, rain = 0.0;
             uint32_t multr = 0, multg = 0, multb = 0;
             int32_t tmp;
-            PyObject* color = NULL;
+            uint32_t index;
 
             if (self->use_biomes) {
                 /* average over all neighbors */
@@ -196,11 +196,10 @@ base_draw(void* data, RenderState* state, PyObject* src, PyObject* mask, PyObjec
             }
 
             /* look up color! */
-            color = PySequence_GetItem(color_table, tabley * 256 + tablex);
-            r = PyLong_AsLong(PyTuple_GET_ITEM(color, 0));
-            g = PyLong_AsLong(PyTuple_GET_ITEM(color, 1));
-            b = PyLong_AsLong(PyTuple_GET_ITEM(color, 2));
-            Py_DECREF(color);
+            index = tabley * 256 + tablex;
+            r = getArrayByte2D(color_table, 0, index);
+            g = getArrayByte2D(color_table, 1, index);
+            b = getArrayByte2D(color_table, 2, index);
 
             /* do the after-coloration */
             r = OV_MULDIV255(r, multr, tmp);
@@ -40,18 +40,14 @@ calculate_light_color_fancy(void* data,
                             uint8_t* r, uint8_t* g, uint8_t* b) {
     RenderPrimitiveLighting* mode = (RenderPrimitiveLighting*)(data);
     uint32_t index;
-    PyObject* color;
 
     blocklight = OV_MAX(blocklight, skylight);
 
     index = skylight + blocklight * 16;
-    color = PySequence_GetItem(mode->lightcolor, index);
 
-    *r = PyLong_AsLong(PyTuple_GET_ITEM(color, 0));
-    *g = PyLong_AsLong(PyTuple_GET_ITEM(color, 1));
-    *b = PyLong_AsLong(PyTuple_GET_ITEM(color, 2));
-
-    Py_DECREF(color);
+    *r = getArrayByte2D(mode->lightcolor, 0, index);
+    *g = getArrayByte2D(mode->lightcolor, 1, index);
+    *b = getArrayByte2D(mode->lightcolor, 2, index);
 }
 
 /* figures out the color from a given skylight and blocklight, used in
@@ -75,16 +71,12 @@ calculate_light_color_fancy_night(void* data,
                                   uint8_t* r, uint8_t* g, uint8_t* b) {
     RenderPrimitiveLighting* mode = (RenderPrimitiveLighting*)(data);
     uint32_t index;
-    PyObject* color;
 
     index = skylight + blocklight * 16;
-    color = PySequence_GetItem(mode->lightcolor, index);
-
-    *r = PyLong_AsLong(PyTuple_GET_ITEM(color, 0));
-    *g = PyLong_AsLong(PyTuple_GET_ITEM(color, 1));
-    *b = PyLong_AsLong(PyTuple_GET_ITEM(color, 2));
 
-    Py_DECREF(color);
+    *r = getArrayByte2D(mode->lightcolor, 0, index);
+    *g = getArrayByte2D(mode->lightcolor, 1, index);
+    *b = getArrayByte2D(mode->lightcolor, 2, index);
 }
 
 /* loads the appropriate light data for the given (possibly non-local)
@@ -272,8 +264,8 @@ lighting_start(void* data, RenderState* state, PyObject* support) {
     }
 
     if (self->color) {
-        self->lightcolor = PyObject_CallMethod(state->textures, "load_light_color", "");
-        if (self->lightcolor == Py_None) {
+        self->lightcolor = (PyArrayObject*)PyObject_CallMethod(state->textures, "load_light_color", "");
+        if ((PyObject*)self->lightcolor == Py_None) {
             Py_DECREF(self->lightcolor);
             self->lightcolor = NULL;
             self->color = false;
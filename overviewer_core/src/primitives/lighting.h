@@ -22,7 +22,7 @@ typedef struct {
     PyObject* facemasks[3];
 
     /* light color image, loaded if color_light is True */
-    PyObject* lightcolor;
+    PyArrayObject* lightcolor;
 
     /* can be overridden in derived rendermodes to control lighting
        arguments are data, skylight, blocklight, return RGB */
@@ -16,7 +16,6 @@
 from collections import OrderedDict
 from copy import deepcopy
 from pathlib import Path
-import re
 import sys
 import imp
 import json
@@ -27,13 +26,30 @@ from io import BytesIO
 import math
 from random import randint
 import numpy
-from PIL import Image, ImageEnhance, ImageOps, ImageDraw
+import PIL
+from PIL import Image, ImageOps, ImageDraw
 import logging
 import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+try:
+    # new in Python 3.8; without it worker processes generate their own
+    # textures, see __setstate__()
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+try:
+    import pyspng
+except ImportError:
+    pyspng = None
 
 from . import util
 
 # global variables to collate information in @material decorators
+# blockmap_generators maps (blockid, data) to the function drawing that block.
+# It is only walked by Textures.generate(); the renderer indexes the flat
+# Textures.blockmap list at blockid * max_data + data instead.
 blockmap_generators = {}
 block_models = {}
 
@@ -55,6 +71,9 @@ nospawn_blocks = set()
 # Initialising the C extension requires access to the globals above.
 # Due to the circular import, this wouldn't work, unless we reload the
 # module in the C extension or just move the import below its dependencies.
+# (alpha_over is used rather than Image.alpha_composite because it's a few
+# times quicker on these small images, and the sprites depend on its exact
+# blending.)
 from .c_overviewer import alpha_over
 
 
@@ -63,6 +82,246 @@ class TextureException(Exception):
     pass
 
 
+def pillow_version():
+    """Returns a description of the Pillow version in use. Pillow-SIMD
+    releases carry a .postN suffix on the version they are based on, and
+    speed up most of what generating the textures spends its time on.
+    """
+    if ".post" in PIL.__version__:
+        return "Pillow-SIMD %s" % PIL.__version__
+    return "Pillow %s" % PIL.__version__
+
+
+@functools.lru_cache(maxsize=None)
+def brightness_table(factor):
+    """Returns a lookup table for Image.point() that scales the RGB bands
+    of an RGBA image by factor and leaves the alpha band untouched.
+
+    This gives exactly the same result as ImageEnhance.Brightness, which
+    blends against black using single precision floats and truncates, but
+    in a single pass and without having to split off and restore the
+    alpha band.
+    """
+    band = numpy.arange(256, dtype=numpy.float32) * numpy.float32(factor)
+    band = numpy.clip(band, 0, 255).astype(numpy.uint8).tolist()
+    return band * 3 + list(range(256))
+
+
+def decode_png(data):
+    """Decodes PNG data to an RGBA image with pyspng, which inflates quite a
+    bit faster than Pillow does. Returns None if pyspng isn't installed, or
+    can't read the data the same way Pillow would, so the caller should fall
+    back to Image.open(). Only 8 bit images that carry their own alpha
+    channel (gray+alpha or RGBA) and have no tRNS chunk are decoded here;
+    pyspng ignores tRNS, so palette, gray and RGB images using it would come
+    out opaque.
+    """
+    if pyspng is None:
+        return None
+    try:
+        header = pyspng.header(data)
+        if header['bit_depth'] != 8 or header['color_type'] not in (4, 6) or b'tRNS' in data:
+            return None
+        return Image.fromarray(pyspng.load(data, format="RGBA"))
+    except (RuntimeError, AttributeError):
+        # AttributeError: the upstream pyspng package installs under the
+        # same name, but has no header()
+        return None
+
+
+def affine_transform(*matrices):
+    """Multiplies the given 3x3 matrices together and returns the first two
+    rows of the result as the 6-tuple that Image.transform() expects for
+    Image.AFFINE.
+    """
+    transform = numpy.identity(3)
+    for matrix in matrices:
+        transform = numpy.dot(transform, matrix)
+    return tuple(transform[:2,:].ravel().tolist())
+
+
+# The perspective transforms used by Textures.transform_image_*(). These
+# never change, so they are only worked out once.
+
+# Translate up and left, since rotations are about the origin, rotate 45
+# degrees, translate back down and right, then scale the image down by a
+# factor of 2
+_ratio = math.cos(math.pi/4)
+TOP_TRANSFORM = affine_transform([[1,0,8.5],[0,1,8.5],[0,0,1]],
+                                 [[_ratio,-_ratio,0],[_ratio,_ratio,0],[0,0,1]],
+                                 [[1,0,-12],[0,1,-12],[0,0,1]],
+                                 [[1,0,0],[0,2,0],[0,0,1]])
+del _ratio
+
+# shear for the left side of the cube
+SIDE_TRANSFORM = affine_transform([[1,0,0],[-0.5,1,0],[0,0,1]])
+
+# shear in the shape of a slope going up in the -y direction
+SLOPE_TRANSFORM = affine_transform([[0.75,-0.5,3],[0.25,0.5,-3],[0,0,1]])
+
+# lookup table used by Textures.generate_opaque_mask(), scales alpha values up
+# by 10 so everything from 26 upwards ends up fully opaque
+OPAQUE_MASK_LUT = [int(min(a, 25.5) * 10) for a in range(256)]
+
+
+@functools.lru_cache(maxsize=64)
+def angle_transform(angle):
+    """Returns the affine transform used by Textures.transform_image_angle()
+    for the given angle (in radians). Callers only ever use a handful of
+    angles, so these are cached.
+    """
+    # some values
+    cos_angle = math.cos(angle)
+    sin_angle = math.sin(angle)
+
+    # function_x and function_y are used to keep the result image in the
+    # same position, and constant_x and constant_y are the coordinates
+    # for the center for angle = 0.
+    constant_x = 6.
+    constant_y = 6.
+    function_x = 6.*(1-cos_angle)
+    function_y = -6*sin_angle
+    big_term = ( (sin_angle * (function_x + constant_x)) - cos_angle* (function_y + constant_y))/cos_angle
+
+    # The numpy array is not really used, but is helpful to
+    # see the matrix used for the transformation.
+    transform = numpy.array([[1./cos_angle, 0, -(function_x + constant_x)/cos_angle],
+                             [-sin_angle/(cos_angle), 1., big_term ],
+                             [0, 0, 1.]])
+
+    return tuple(transform[0]) + tuple(transform[1])
+
+
+def shrink_face(img, newsize=(12, 12)):
+    """Scales a texture down to newsize, by default 12x12, the size of a block
+    face before it is sheared. Blocks share most of their textures, so the
+    results are cached by the contents of the texture. Don't change them.
+    """
+    if img.mode == "P":
+        return img.resize(newsize, Image.ANTIALIAS)
+    return _shrink_face(img.mode, img.size, img.tobytes(), newsize)
+
+
+@functools.lru_cache(maxsize=4096)
+def _shrink_face(mode, size, data, newsize):
+    return Image.frombytes(mode, size, data).resize(newsize, Image.ANTIALIAS)
+
+
+@functools.lru_cache(maxsize=None)
+def blank_block(bgcolor):
+    """Returns an empty 24x24 block image filled with bgcolor. The image is
+    shared, so copy it before drawing on it. Copying is a bit quicker than
+    making and filling a new image."""
+    return Image.new("RGBA", (24, 24), bgcolor)
+
+
+def rotate_square(img, angle):
+    """Rotates the square image img counter clockwise by angle, which has to
+    be a multiple of 90 degrees. Unlike Image.rotate() this goes straight to
+    transpose(), with no resampling. Always returns a new image."""
+    angle %= 360
+    if angle == 0:
+        return img.copy()
+    return img.transpose(ROTATE_TRANSPOSES[angle])
+
+ROTATE_TRANSPOSES = {90: Image.ROTATE_90, 180: Image.ROTATE_180, 270: Image.ROTATE_270}
+
+
+def cache_by_contents(func):
+    """Decorator for functions taking a single texture, that caches their
+    results by the contents of the texture. Lots of blocks are drawn from
+    the same few textures. Callers get a copy of the cached image, so they can
+    change it. Images with a palette are never cached. Like with lru_cache,
+    cache_clear() empties the cache.
+    """
+    @functools.lru_cache(maxsize=4096)
+    def cached(mode, size, data):
+        return func(Image.frombytes(mode, size, data))
+
+    @functools.wraps(func)
+    def wrapper(img):
+        if img.mode == "P":
+            return func(img)
+        return cached(img.mode, img.size, img.tobytes()).copy()
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+# the numbers the model code uses for block orientations, and back
+ORIENTATION_VALUES = {'south': 0, 'west': 1, 'north': 2, 'east': 3, 'up': 4, 'down': 6}
+VALUE_ORIENTATIONS = {value: orientation for orientation, value in ORIENTATION_VALUES.items()}
+
+# how far the top and bottom faces of an element are set back
+SETBACK_FACES = {'up': 16, 'down': 0}
+
+# which face of a texture ends up on each face of a block lying along the
+# x or z axis, and how far the texture is rotated there
+AXIS_FACES = {
+    'x': {'up': 'north', 'north': 'down', 'down': 'south', 'south': 'up', 'east': 'east', 'west': 'west'},
+    'z': {'up': 'west', 'west': 'down', 'down': 'east', 'east': 'up', 'north': 'north', 'south': 'south'},
+}
+AXIS_ROTATIONS = {
+    'x': {'up': 270, 'north': 0, 'down': 0, 'south': 0, 'east': 270, 'west': 270},
+    'z': {'up': 0, 'west': 0, 'down': 0, 'east': 0, 'north': 90, 'south': 90},
+}
+
+# where the faces of a model that don't depend on the element's size go, and
+# how much each face is darkened, see Textures.image_pos() and
+# Textures.adjust_lighting()
+FACE_POSITIONS = {'east': (0, 0), 'south': (12, 0)}
+FACE_LIGHTING = {'south': 0.8, 'west': 0.8, 'north': 0.9, 'east': 0.9}
+
+
+def facing_to_real(rotation, blockfacing, targetblockface):
+    """Works out which face of the model is shown on targetblockface of a
+    block facing blockfacing, for the given map rotation. Only used to fill
+    in FACING_TO_REAL."""
+    if blockfacing == 'up':
+        return {'up': 'north', 'north': 'west', 'west': 'down'}.get(targetblockface, blockfacing)
+    if blockfacing == 'down':
+        return {'west': 'down', 'north': 'west', 'up': 'south'}.get(targetblockface, blockfacing)
+    if targetblockface in ('up', 'down'):
+        return targetblockface
+    return VALUE_ORIENTATIONS[(ORIENTATION_VALUES[targetblockface] + [0, 3, 2, 1][ORIENTATION_VALUES[blockfacing]]
+                               + 1 + rotation + (rotation % 2) * 2) % 4]
+
+# Textures.map_facing_to_real() for every map rotation, as
+# FACING_TO_REAL[rotation][blockfacing, targetblockface]
+FACING_TO_REAL = [{(blockfacing, targetblockface): facing_to_real(rotation, blockfacing, targetblockface)
+                   for blockfacing in ORIENTATION_VALUES for targetblockface in ORIENTATION_VALUES}
+                  for rotation in range(4)]
+
+
+# fixes for known inconsistencies in model info, see Textures.normalize_model()
+def fix_observer_model(model):
+    model['elements'][0]['faces']['up']['uv'] = [0, 0, 16, 16]
+
+def fix_loom_model(model):
+    model['elements'][0]['faces']['up']['texturerotation'] = 180
+    model['elements'][0]['faces']['down']['texturerotation'] = 180
+
+def fix_barrel_model(model):
+    model['elements'][0]['faces']['north']['texture'] = '#up'
+    model['elements'][0]['faces']['south']['texture'] = '#down'
+    model['elements'][0]['faces']['down']['texture'] = '#north'
+    model['elements'][0]['faces']['up']['texture'] = '#south'
+    model['elements'][0]['faces']['east']['texturerotation'] = 90
+    model['elements'][0]['faces']['west']['texturerotation'] = 90
+
+def fix_vertical_dispenser_model(model):
+    model['elements'][0]['faces']['north']['texture'] = '#up'
+    model['elements'][0]['faces']['up']['texture'] = '#north'
+
+MODEL_FIXES = {
+    'block/observer': fix_observer_model,
+    'block/loom': fix_loom_model,
+    'block/barrel': fix_barrel_model,
+    'block/barrel_open': fix_barrel_model,
+    'block/dropper_vertical': fix_vertical_dispenser_model,
+    'block/dispenser_vertical': fix_vertical_dispenser_model,
+}
+
+
 color_map = ["white", "orange", "magenta", "light_blue", "yellow", "lime", "pink", "gray",
              "light_gray", "cyan", "purple", "blue", "brown", "green", "red", "black"]
 
@@ -91,8 +350,37 @@ class Textures(object):
         # see load_image_texture()
         self.texture_cache = {}
 
+        # see build_sides()
+        self.side_cache = {}
+
+        # see build_block()
+        self.block_cache = {}
+
+        # see build_block_from_model()
+        self.model_block_cache = {}
+
+        # blocks that several materials share, see bed()
+        self.material_cache = {}
+
+        # see texture_file_from_model()
+        self.model_texture_files = {}
+
         # once we find a jarfile that contains a texture, we cache the ZipFile object here
         self.jars = OrderedDict()
+
+        # maps every file name in the jars above to the jar to open it from,
+        # see add_jar()
+        self.jar_index = {}
+
+        # every jar we looked inside so far, see open_jar()
+        self.jar_contents = {}
+
+        # the files in every directory we looked inside so far, see isfile()
+        self.dir_contents = {}
+
+        # the client jar versions directory and the versions found in it,
+        # see client_jar_versions()
+        self.client_versions = None
     
     ##
     ## pickle support
@@ -101,21 +389,38 @@ class Textures(object):
     def __getstate__(self):
         # we must get rid of the huge image lists, and other images
         attributes = self.__dict__.copy()
-        for attr in ['blockmap', 'biome_grass_texture', 'watertexture', 'lavatexture', 'firetexture', 'portaltexture', 'lightcolor', 'grasscolor', 'foliagecolor', 'watercolor', 'texture_cache']:
+        for attr in ['blockmap', 'watertexture', 'lavatexture', 'firetexture', 'portaltexture', 'lightcolor', 'grasscolor', 'foliagecolor', 'watercolor', 'texture_cache', 'side_cache', 'block_cache', 'model_block_cache', 'material_cache', 'blockmap_pixels', 'blockmap_masks']:
             try:
                 del attributes[attr]
             except KeyError:
                 pass
         attributes['jars'] = OrderedDict()
+        attributes['jar_index'] = {}
+        attributes['jar_contents'] = {}
+        attributes['dir_contents'] = {}
+        attributes['client_versions'] = None
+        # the blockmap sprites are in shared memory, only pass on its name
+        if 'blockmap_memory' in attributes:
+            attributes['blockmap_memory'] = self.blockmap_memory.name
         return attributes
 
     def __setstate__(self, attrs):
-        # regenerate textures, if needed
+        # attach to the textures generated by whoever pickled us, or
+        # regenerate them if that's not possible (or shared_memory is
+        # missing)
         for attr, val in list(attrs.items()):
             setattr(self, attr, val)
         self.texture_cache = {}
+        self.side_cache = {}
+        self.block_cache = {}
+        self.model_block_cache = {}
+        self.material_cache = {}
         if self.generated:
-            self.generate()
+            try:
+                self.blockmap_memory = shared_memory.SharedMemory(self.blockmap_memory)
+                self.unpack_blockmap()
+            except (AttributeError, OSError):
+                self.generate()
     
     ##
     ## The big one: generate()
@@ -137,35 +442,152 @@ class Textures(object):
         # generate biome grass mask
         self.biome_grass_texture = self.build_block(self.load_image_texture("assets/minecraft/textures/block/grass_block_top.png"), self.load_image_texture("assets/minecraft/textures/block/grass_block_side_overlay.png"))
         
-        # generate the blocks
+        # generate the blocks. Most of the time is spent in PIL and in
+        # alpha_over, which both let go of the GIL, so use a few threads.
+        # Worker processes would have to send every image back through a
+        # pickle, and couldn't share the texture and block caches.
+        # Textures are read from disk by whichever thread asks for them
+        # first, so reading them already overlaps with drawing other
+        # blocks, and rendering itself never has to wait for a file.
         global blockmap_generators
         self.blockmap = [None] * max_blockid * max_data
 
-        for (blockid, data), texgen in list(blockmap_generators.items()):
-            tex = texgen(self, blockid, data)
-            self.blockmap[blockid * max_data + data] = self.generate_texture_tuple(tex)
+        # The blocks are handed out in batches, as a future for every single
+        # one costs about as much as drawing a simple block. Neighbouring
+        # data values of a block then also end up in the same thread.
+        def generate_blocks(items):
+            result = []
+            for (blockid, data), texgen in items:
+                tex = texgen(self, blockid, data)
+                result.append((blockid * max_data + data, self.generate_texture_tuple(tex)))
+            return result
+
+        items = list(blockmap_generators.items())
+        batches = [items[i:i + 64] for i in range(0, len(items), 64)]
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            for result in pool.map(generate_blocks, batches):
+                for index, tex in result:
+                    self.blockmap[index] = tex
         
         if self.texture_size != 24:
             # rescale biome grass
             self.biome_grass_texture = self.biome_grass_texture.resize(self.texture_dimensions, Image.ANTIALIAS)
             
-            # rescale the rest
-            for i, tex in enumerate(self.blockmap):
+            # rescale the rest. Lots of blocks look exactly the same, so
+            # only scale each of those images once
+            scaled = {}
+            for blockid, data in blockmap_generators:
+                index = blockid * max_data + data
+                tex = self.blockmap[index]
                 if tex is None:
                     continue
-                block = tex[0]
-                scaled_block = block.resize(self.texture_dimensions, Image.ANTIALIAS)
-                self.blockmap[i] = self.generate_texture_tuple(scaled_block)
-        
+                key = tex[0].tobytes()
+                if key not in scaled:
+                    scaled_block = tex[0].resize(self.texture_dimensions, Image.ANTIALIAS)
+                    scaled[key] = self.generate_texture_tuple(scaled_block)
+                self.blockmap[index] = scaled[key]
+
+        self.pack_blockmap()
+
+        # The loaded textures are hardly needed once the blocks are built, so
+        # only hang on to their pixels, with all the 16x16 ones stacked in a
+        # single array. load_image() turns them back into images if they're
+        # asked for again.
+        tiles = []
+        for filename, img in self.texture_cache.items():
+            if isinstance(img, Image.Image):
+                pixels = numpy.asarray(img)
+                if pixels.shape == (16, 16, 4):
+                    tiles.append((filename, pixels))
+                else:
+                    self.texture_cache[filename] = pixels
+        if tiles:
+            atlas = numpy.stack([pixels for _, pixels in tiles])
+            for i, (filename, _) in enumerate(tiles):
+                self.texture_cache[filename] = atlas[i]
+        self.side_cache.clear()
+        self.block_cache.clear()
+        self.model_block_cache.clear()
+        self.material_cache.clear()
+        # the module level caches of transformed textures too
+        _shrink_face.cache_clear()
+        self.transform_image_top.cache_clear()
+        self.transform_image_side.cache_clear()
+        self.transform_image_slope.cache_clear()
+
         self.generated = True
-    
+
+    def pack_blockmap(self):
+        """Moves the pixels of every sprite in the blockmap into one block of
+        shared memory, and swaps the sprites for images that are views into
+        it. Lots of blocks end up with identical sprites, so these are only
+        stored once and share the same tuple. Worker processes attach to the
+        shared memory when they unpickle us, instead of generating all the
+        textures again. The sprites are not kept on disk between runs; that
+        would have to track every jar, resource pack and option they were
+        built from.
+
+        Without multiprocessing.shared_memory (Python < 3.8) the blockmap is
+        left as it is, and worker processes regenerate it.
+        """
+        if shared_memory is None:
+            return
+
+        sprites = {}
+        for blockid, data in blockmap_generators:
+            index = blockid * max_data + data
+            tex = self.blockmap[index]
+            if tex is not None:
+                key = tex[0].tobytes() + tex[1].tobytes()
+                sprites.setdefault(key, []).append(index)
+
+        width, height = self.texture_dimensions
+        size = len(sprites) * height * width * 5
+        self.blockmap_memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        # only the process that made the shared memory gets rid of it
+        weakref.finalize(self, self.blockmap_memory.unlink)
+
+        # maps blockmap indices to sprite numbers
+        self.blockmap_sprites = {}
+        pixels, masks = self.blockmap_arrays(len(sprites))
+        for i, indices in enumerate(sprites.values()):
+            img, mask = self.blockmap[indices[0]]
+            pixels[i] = numpy.asarray(img.convert("RGBA"))
+            masks[i] = numpy.asarray(mask)
+            for index in indices:
+                self.blockmap_sprites[index] = i
+        self.unpack_blockmap()
+
+    def blockmap_arrays(self, count):
+        """Returns two arrays that look into blockmap_memory: the pixels of
+        count sprites, followed by their masks."""
+        width, height = self.texture_dimensions
+        buf = self.blockmap_memory.buf
+        pixels = numpy.ndarray((count, height, width, 4), numpy.uint8, buf)
+        masks = numpy.ndarray((count, height, width), numpy.uint8, buf, pixels.nbytes)
+        return pixels, masks
+
+    def unpack_blockmap(self):
+        """Builds the blockmap out of the sprites that pack_blockmap() put
+        in blockmap_memory.
+        """
+        count = max(self.blockmap_sprites.values(), default=-1) + 1
+        self.blockmap_pixels, self.blockmap_masks = self.blockmap_arrays(count)
+
+        width, height = self.texture_dimensions
+        sprites = [(Image.frombuffer("RGBA", (width, height), self.blockmap_pixels[i], "raw", "RGBA", 0, 1),
+                    Image.frombuffer("L", (width, height), self.blockmap_masks[i], "raw", "L", 0, 1))
+                   for i in range(count)]
+        self.blockmap = [None] * max_blockid * max_data
+        for index, i in self.blockmap_sprites.items():
+            self.blockmap[index] = sprites[i]
+
     # TODO: load models from resource packs, for now only client jars are used
     # TODO: load blockstate before models
     def find_models(self, verbose=False):
         filename = 'assets/minecraft/models/'
-        versiondir = self.versiondir(verbose)
-        available_versions = self.available_versions(versiondir, verbose)
-        
+        versiondir, available_versions = self.client_jar_versions(verbose)
+
         if not available_versions:
             if verbose:
                 logging.info("Did not find any non-snapshot minecraft jars >=1.8.0")
@@ -178,25 +600,22 @@ class Textures(object):
             jarname = ".".join(str(x) for x in most_recent_version)
             jarpath = os.path.join(versiondir, jarname, jarname + ".jar")
 
-            jar = {}
-
-            if jarpath in self.jars:
-                jar = self.jars[jarpath]
-            elif os.path.isfile(jarpath):
-                try:
-                    jar = zipfile.ZipFile(jarpath)
-                except (KeyError, IOError) as e:
-                    pass
-                except (zipfile.BadZipFile) as e:
-                    logging.warning("Your jar {0} is corrupted, I'll be skipping it, but you "
-                                    "should probably look into that.".format(jarpath))
-            else:
+            if not os.path.isfile(jarpath):
                 if verbose:
                     logging.info("Did not find file {0} in jar {1}".format(filename, jarpath))
                 continue
 
+            try:
+                jar, names = self.open_jar(jarpath)
+            except (KeyError, IOError) as e:
+                continue
+            except (zipfile.BadZipFile) as e:
+                logging.warning("Your jar {0} is corrupted, I'll be skipping it, but you "
+                                "should probably look into that.".format(jarpath))
+                continue
+
             models = []
-            for file in jar.namelist():
+            for file in names:
                 if file.startswith('assets/minecraft/models/block'):
                     model = Path(file).stem
                     models.append(model)
@@ -241,13 +660,13 @@ class Textures(object):
         programdir = util.get_program_path()
         if verbose: logging.info("Looking for texture in overviewer_core/data/textures")
         path = os.path.join(programdir, "overviewer_core", "data", "textures", filename)
-        if os.path.isfile(path):
+        if self.isfile(path):
             if verbose: logging.info("Found %s in '%s'", filename, path)
             return open(path, mode)
         elif hasattr(sys, "frozen") or imp.is_frozen("__main__"):
             # windows special case, when the package dir doesn't exist
             path = os.path.join(programdir, "textures", filename)
-            if os.path.isfile(path):
+            if self.isfile(path):
                 if verbose: logging.info("Found %s in '%s'", filename, path)
                 return open(path, mode)
 
@@ -259,16 +678,13 @@ class Textures(object):
                 # Must be a resource pack. Look for the requested file within
                 # it.
                 try:
-                    pack = zipfile.ZipFile(self.find_file_local_path)
-                    # pack.getinfo() will raise KeyError if the file is
-                    # not found.
-                    pack.getinfo(filename)
-                    if verbose: logging.info("Found %s in '%s'", filename,
-                                             self.find_file_local_path)
-                    self.jars[self.find_file_local_path] = pack
-                    # ok cool now move this to the start so we pick it first
-                    self.jars.move_to_end(self.find_file_local_path, last=False)
-                    return pack.open(filename)
+                    pack, names = self.open_jar(self.find_file_local_path)
+                    if filename in names:
+                        if verbose: logging.info("Found %s in '%s'", filename,
+                                                 self.find_file_local_path)
+                        # ok cool now put this at the start so we pick it first
+                        self.add_jar(self.find_file_local_path, first=True)
+                        return pack.open(filename)
                 except (zipfile.BadZipfile, KeyError, IOError):
                     pass
             elif os.path.isdir(self.find_file_local_path):
@@ -278,16 +694,16 @@ class Textures(object):
                         return open(full_path, mode)
 
         # We already have some jars open, better use them.
-        if len(self.jars) > 0:
-            for jarpath in self.jars:
-                try:
-                    jar = self.jars[jarpath]
-                    jar.getinfo(filename)
-                    if verbose: logging.info("Found (cached) %s in '%s'", filename,
-                                             jarpath)
-                    return jar.open(filename)
-                except (KeyError, IOError) as e:
-                    pass
+        jarpath = self.jar_index.get(filename)
+        if jarpath is not None:
+            try:
+                jar = self.jars[jarpath]
+                fileobj = jar.open(filename)
+                if verbose: logging.info("Found (cached) %s in '%s'", filename,
+                                         jarpath)
+                return fileobj
+            except (KeyError, IOError) as e:
+                pass
 
         # If we haven't returned at this point, then the requested file was NOT
         # found in the user-specified texture path or resource pack.
@@ -296,7 +712,7 @@ class Textures(object):
 
         # Look in the location of the overviewer executable for the given path
         path = os.path.join(programdir, filename)
-        if os.path.isfile(path):
+        if self.isfile(path):
             if verbose: logging.info("Found %s in '%s'", filename, path)
             return open(path, mode)
 
@@ -311,9 +727,8 @@ class Textures(object):
 
         # Find an installed minecraft client jar and look in it for the texture
         # file we need.
-        versiondir = self.versiondir(verbose)
-        available_versions = self.available_versions(versiondir, verbose)
-        
+        versiondir, available_versions = self.client_jar_versions(verbose)
+
         if not available_versions:
             if verbose: logging.info("Did not find any non-snapshot minecraft jars >=1.8.0")
         while(available_versions):
@@ -325,11 +740,11 @@ class Textures(object):
 
             if os.path.isfile(jarpath):
                 try:
-                    jar = zipfile.ZipFile(jarpath)
-                    jar.getinfo(filename)
-                    if verbose: logging.info("Found %s in '%s'", filename, jarpath)
-                    self.jars[jarpath] = jar
-                    return jar.open(filename)
+                    jar, names = self.open_jar(jarpath)
+                    if filename in names:
+                        if verbose: logging.info("Found %s in '%s'", filename, jarpath)
+                        self.add_jar(jarpath)
+                        return jar.open(filename)
                 except (KeyError, IOError) as e:
                     pass
                 except (zipfile.BadZipFile) as e:
@@ -341,6 +756,71 @@ class Textures(object):
 
         raise TextureException("Could not find the textures while searching for '{0}'. Try specifying the 'texturepath' option in your config file.\nSet it to the path to a Minecraft Resource pack.\nAlternately, install the Minecraft client (which includes textures)\nAlso see <http://docs.overviewer.org/en/latest/running/#installing-the-textures>\n(Remember, this version of Overviewer requires a 1.19-compatible resource pack)\n(Also note that I won't automatically use snapshots; you'll have to use the texturepath option to use a snapshot jar)".format(filename))
 
+    def isfile(self, path):
+        """Like os.path.isfile(), but checks a cached listing of the
+        directory instead, so looking for hundreds of textures in the same
+        few directories only reads each of them once. Names are matched case
+        sensitively, so this is only used for the directories that ship with
+        Overviewer; paths the user typed go through os.path.isfile().
+        """
+        dirname, basename = os.path.split(path)
+        try:
+            names = self.dir_contents[dirname]
+        except KeyError:
+            try:
+                with os.scandir(dirname or os.curdir) as entries:
+                    names = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                names = set()
+            self.dir_contents[dirname] = names
+        return basename in names
+
+    # generate() looks for textures from several threads at once
+    jar_lock = threading.Lock()
+
+    def open_jar(self, jarpath):
+        """Opens a resource pack or client jar, or returns the one that is
+        already open, along with the names of the files inside it. The names
+        are the keys of a dict, so they keep their order in the jar and can be
+        checked for quickly.
+        """
+        with self.jar_lock:
+            try:
+                return self.jar_contents[jarpath]
+            except KeyError:
+                pass
+            jar = zipfile.ZipFile(jarpath)
+            contents = (jar, dict.fromkeys(jar.namelist()))
+            self.jar_contents[jarpath] = contents
+            return contents
+
+    def add_jar(self, jarpath, first=False):
+        """Adds a resource pack or client jar to the ones searched for
+        textures and indexes the files it contains, so find_file() can go
+        straight to the right jar instead of asking each one in turn. Jars
+        added with first=True take priority over the ones already added.
+        """
+        jar, names = self.open_jar(jarpath)
+        self.jars[jarpath] = jar
+        if first:
+            self.jars.move_to_end(jarpath, last=False)
+            for name in names:
+                self.jar_index[name] = jarpath
+        else:
+            for name in names:
+                self.jar_index.setdefault(name, jarpath)
+
+    def client_jar_versions(self, verbose):
+        """Returns the directory the client jars are installed in, and a list
+        of the usable versions found there, newest first. These won't change
+        while we're running, so the directory is only looked at once.
+        """
+        if self.client_versions is None:
+            versiondir = self.versiondir(verbose)
+            self.client_versions = (versiondir, self.available_versions(versiondir, verbose))
+        versiondir, available_versions = self.client_versions
+        return versiondir, list(available_versions)
+
     def versiondir(self, verbose):
         versiondir = ""
         if "APPDATA" in os.environ and sys.platform.startswith("win"):
@@ -391,7 +871,12 @@ class Textures(object):
 
     def load_image_texture(self, filename):
         # Textures may be animated or in a different resolution than 16x16.  
-        # This method will always return a 16x16 image
+        # This method will always return a 16x16 image. The result is cached
+        # and shared between all callers, so copy it before changing it.
+
+        img = self.texture_cache.get(filename)
+        if isinstance(img, Image.Image) and img.size == (16, 16):
+            return img
 
         img = self.load_image(filename)
 
@@ -411,6 +896,8 @@ class Textures(object):
             img = self.texture_cache[filename]
             if isinstance(img, Exception):  # Did we cache an exception?
                 raise img                   # Okay then, raise it.
+            if isinstance(img, numpy.ndarray):  # Compacted by generate()
+                img = self.texture_cache[filename] = Image.fromarray(img)
             return img
         except KeyError:
             pass
@@ -422,9 +909,12 @@ class Textures(object):
             # a texture, so that we do not repeatedly search for it.
             self.texture_cache[filename] = e
             raise e
-        buffer = BytesIO(fileobj.read())
+        with fileobj:
+            data = fileobj.read()
+        img = decode_png(data)
         try:
-            img = Image.open(buffer).convert("RGBA")
+            if img is None:
+                img = Image.open(BytesIO(data)).convert("RGBA")
         except IOError:
             raise TextureException("The texture {} appears to be corrupted. Please fix it. Run "
                                    "Overviewer in verbose mode (-v) to find out where I loaded "
@@ -459,12 +949,17 @@ class Textures(object):
         self.portaltexture = portaltexture
         return portaltexture
     
+    def load_color_table(self, filename):
+        """Loads an image as a color lookup table for the C extension: an
+        (N, 4) uint8 array holding its RGBA pixels in getdata() order."""
+        return numpy.asarray(self.load_image(filename)).reshape(-1, 4)
+
     def load_light_color(self):
         """Helper function to load the light color texture."""
         if hasattr(self, "lightcolor"):
             return self.lightcolor
         try:
-            lightcolor = list(self.load_image("light_normal.png").getdata())
+            lightcolor = self.load_color_table("light_normal.png")
         except Exception:
             logging.warning("Light color image could not be found.")
             lightcolor = None
@@ -474,41 +969,37 @@ class Textures(object):
     def load_grass_color(self):
         """Helper function to load the grass color texture."""
         if not hasattr(self, "grasscolor"):
-            self.grasscolor = list(self.load_image("assets/minecraft/textures/colormap/grass.png").getdata())
+            self.grasscolor = self.load_color_table("assets/minecraft/textures/colormap/grass.png")
         return self.grasscolor
 
     def load_foliage_color(self):
         """Helper function to load the foliage color texture."""
         if not hasattr(self, "foliagecolor"):
-            self.foliagecolor = list(self.load_image("assets/minecraft/textures/colormap/foliage.png").getdata())
+            self.foliagecolor = self.load_color_table("assets/minecraft/textures/colormap/foliage.png")
         return self.foliagecolor
 
     #I guess "watercolor" is wrong. But I can't correct as my texture pack don't define water color.
     def load_water_color(self):
         """Helper function to load the water color texture."""
         if not hasattr(self, "watercolor"):
-            self.watercolor = list(self.load_image("watercolor.png").getdata())
+            self.watercolor = self.load_color_table("watercolor.png")
         return self.watercolor
 
     def _split_terrain(self, terrain):
         """Builds and returns a length 256 array of each 16x16 chunk
         of texture.
         """
-        textures = []
         (terrain_width, terrain_height) = terrain.size
-        texture_resolution = terrain_width / 16
-        for y in range(16):
-            for x in range(16):
-                left = x*texture_resolution
-                upper = y*texture_resolution
-                right = left+texture_resolution
-                lower = upper+texture_resolution
-                region = terrain.transform(
-                          (16, 16),
-                          Image.EXTENT,
-                          (left,upper,right,lower),
-                          Image.BICUBIC)
-                textures.append(region)
+        texture_resolution = terrain_width // 16
+
+        # slice the atlas into its 16x16 grid of tiles in one go
+        tiles = numpy.asarray(terrain.convert("RGBA"))[:texture_resolution * 16]
+        tiles = tiles.reshape(16, texture_resolution, 16, texture_resolution, 4)
+        tiles = tiles.swapaxes(1, 2).reshape(256, texture_resolution, texture_resolution, 4)
+
+        textures = [Image.fromarray(tile, "RGBA") for tile in tiles]
+        if texture_resolution != 16:
+            textures = [tex.resize((16, 16), Image.BICUBIC) for tex in textures]
 
         return textures
 
@@ -516,7 +1007,16 @@ class Textures(object):
     ## Image Transformation Functions
     ##
 
+    # The block functions load textures, put them through these transforms
+    # and alpha_over the results onto a 24x24 image. Both the transforms
+    # (Image.transform) and alpha_over already run in C, and the transforms
+    # are cached by the contents of the texture, so what is left in Python
+    # per block is a handful of calls. Moving the whole pipeline into C
+    # would also mean reimplementing Pillow's resampling exactly, or every
+    # block would come out slightly different.
+
     @staticmethod
+    @cache_by_contents
     def transform_image_top(img):
         """Takes a PIL image and rotates it left 45 degrees and shrinks the y axis
         by a factor of 2. Returns the resulting image, which will be 24x12 pixels
@@ -527,55 +1027,32 @@ class Textures(object):
         # even number that can be split in half twice
         img = img.resize((17, 17), Image.ANTIALIAS)
 
-        # Build the Affine transformation matrix for this perspective
-        transform = numpy.matrix(numpy.identity(3))
-        # Translate up and left, since rotations are about the origin
-        transform *= numpy.matrix([[1,0,8.5],[0,1,8.5],[0,0,1]])
-        # Rotate 45 degrees
-        ratio = math.cos(math.pi/4)
-        #transform *= numpy.matrix("[0.707,-0.707,0;0.707,0.707,0;0,0,1]")
-        transform *= numpy.matrix([[ratio,-ratio,0],[ratio,ratio,0],[0,0,1]])
-        # Translate back down and right
-        transform *= numpy.matrix([[1,0,-12],[0,1,-12],[0,0,1]])
-        # scale the image down by a factor of 2
-        transform *= numpy.matrix("[1,0,0;0,2,0;0,0,1]")
-
-        transform = numpy.array(transform)[:2,:].ravel().tolist()
-
-        newimg = img.transform((24,12), Image.AFFINE, transform)
+        newimg = img.transform((24,12), Image.AFFINE, TOP_TRANSFORM)
         return newimg
 
     @staticmethod
+    @cache_by_contents
     def transform_image_side(img):
         """Takes an image and shears it for the left side of the cube (reflect for
         the right side)"""
 
-        # Size of the cube side before shear
-        img = img.resize((12,12), Image.ANTIALIAS)
-
-        # Apply shear
-        transform = numpy.matrix(numpy.identity(3))
-        transform *= numpy.matrix("[1,0,0;-0.5,1,0;0,0,1]")
-
-        transform = numpy.array(transform)[:2,:].ravel().tolist()
+        # Size of the cube side before shear. The result is cached by
+        # contents already, so no need to go through shrink_face()
+        img = img.resize((12, 12), Image.ANTIALIAS)
 
-        newimg = img.transform((12,18), Image.AFFINE, transform)
+        newimg = img.transform((12,18), Image.AFFINE, SIDE_TRANSFORM)
         return newimg
 
     @staticmethod
+    @cache_by_contents
     def transform_image_slope(img):
         """Takes an image and shears it in the shape of a slope going up
         in the -y direction (reflect for +x direction). Used for minetracks"""
 
         # Take the same size as trasform_image_side
-        img = img.resize((12,12), Image.ANTIALIAS)
+        img = img.resize((12, 12), Image.ANTIALIAS)
 
-        # Apply shear
-        transform = numpy.matrix(numpy.identity(3))
-        transform *= numpy.matrix("[0.75,-0.5,3;0.25,0.5,-3;0,0,1]")
-        transform = numpy.array(transform)[:2,:].ravel().tolist()
-
-        newimg = img.transform((24,24), Image.AFFINE, transform)
+        newimg = img.transform((24,24), Image.AFFINE, SLOPE_TRANSFORM)
 
         return newimg
 
@@ -592,59 +1069,86 @@ class Textures(object):
         """
 
         # Take the same size as trasform_image_side
-        img = img.resize((12,12), Image.ANTIALIAS)
+        img = shrink_face(img)
 
-        # some values
-        cos_angle = math.cos(angle)
-        sin_angle = math.sin(angle)
+        newimg = img.transform((24,24), Image.AFFINE, angle_transform(angle))
 
-        # function_x and function_y are used to keep the result image in the 
-        # same position, and constant_x and constant_y are the coordinates
-        # for the center for angle = 0.
-        constant_x = 6.
-        constant_y = 6.
-        function_x = 6.*(1-cos_angle)
-        function_y = -6*sin_angle
-        big_term = ( (sin_angle * (function_x + constant_x)) - cos_angle* (function_y + constant_y))/cos_angle
+        return newimg
 
-        # The numpy array is not really used, but is helpful to 
-        # see the matrix used for the transformation.
-        transform = numpy.array([[1./cos_angle, 0, -(function_x + constant_x)/cos_angle],
-                                 [-sin_angle/(cos_angle), 1., big_term ],
-                                 [0, 0, 1.]])
+    @staticmethod
+    def darken(img, factor):
+        """Darkens the color bands of an RGBA image by factor, keeping its
+        alpha layer as it is. Returns a new image."""
+        return img.point(brightness_table(factor))
 
-        transform = tuple(transform[0]) + tuple(transform[1])
+    @staticmethod
+    def fill_seams(img, left, right):
+        """Fills in the pixels that the side shears leave as gaps along the
+        edges of a block image, in place. Every x,y in left gets a copy of
+        the pixel at x+1,y and every x,y in right a copy of the one at x-1,y.
+        """
+        pixels = img.load()
+        for x,y in left:
+            pixels[x,y] = pixels[x+1,y]
+        for x,y in right:
+            pixels[x,y] = pixels[x-1,y]
+
+    def build_sides(self, side):
+        """From a side texture, build the left and right sides of a block,
+        sheared and darkened slightly. Returns the two images as a tuple.
+        These are cached, see shade_side(). Don't change them.
+        """
+        return self.shade_side(side, 0.9), self.shade_side(side, 0.8, flip=True)
 
-        newimg = img.transform((24,24), Image.AFFINE, transform)
+    def shade_side(self, side, factor, flip=False):
+        """From a side texture, build one side of a block: sheared for the
+        left side (or the right side, if flip is set), and darkened by factor.
 
-        return newimg
+        Lots of blocks are built from the same side textures, so the results
+        are cached by the contents of the texture. Don't change them.
+        """
+        key = (side.mode, side.size, side.tobytes(), factor, flip)
+        try:
+            return self.side_cache[key]
+        except KeyError:
+            pass
+
+        side = self.transform_image_side(side)
+        if flip:
+            side = side.transpose(Image.FLIP_LEFT_RIGHT)
+        # leave the alpha layer alone, we don't want to "darken" it making
+        # the block transparent
+        side = self.side_cache[key] = self.darken(side, factor)
+        return side
 
     def build_block(self, top, side):
         """From a top texture and a side texture, build a block image.
         top and side should be 16x16 image objects. Returns a 24x24 image
 
+        The same pairs of textures are built over and over again, so the
+        results are cached by the contents of the textures. Callers get
+        their own copy to draw on.
         """
-        img = Image.new("RGBA", (24,24), self.bgcolor)
+        key = (top.mode, top.size, top.tobytes(), side and (side.mode, side.size, side.tobytes()))
+        try:
+            img = self.block_cache[key]
+        except KeyError:
+            img = self.block_cache[key] = self._build_block(top, side)
+        return img.copy()
 
-        original_texture = top.copy()
-        top = self.transform_image_top(top)
+    def _build_block(self, top, side):
+        img = Image.new("RGBA", (24,24), self.bgcolor)
 
         if not side:
+            # nothing to draw if the top is completely see-through
+            if top.mode == "RGBA" and top.getextrema()[3] == (0, 0):
+                return img
+            top = self.transform_image_top(top)
             alpha_over(img, top, (0,0), top)
             return img
 
-        side = self.transform_image_side(side)
-        otherside = side.transpose(Image.FLIP_LEFT_RIGHT)
-
-        # Darken the sides slightly. These methods also affect the alpha layer,
-        # so save them first (we don't want to "darken" the alpha layer making
-        # the block transparent)
-        sidealpha = side.split()[3]
-        side = ImageEnhance.Brightness(side).enhance(0.9)
-        side.putalpha(sidealpha)
-        othersidealpha = otherside.split()[3]
-        otherside = ImageEnhance.Brightness(otherside).enhance(0.8)
-        otherside.putalpha(othersidealpha)
+        top = self.transform_image_top(top)
+        side, otherside = self.build_sides(side)
 
         alpha_over(img, top, (0,0), top)
         alpha_over(img, side, (0,6), side)
@@ -652,12 +1156,7 @@ class Textures(object):
 
         # Manually touch up 6 pixels that leave a gap because of how the
         # shearing works out. This makes the blocks perfectly tessellate-able
-        for x,y in [(13,23), (17,21), (21,19)]:
-            # Copy a pixel to x,y from x-1,y
-            img.putpixel((x,y), img.getpixel((x-1,y)))
-        for x,y in [(3,4), (7,2), (11,0)]:
-            # Copy a pixel to x,y from x+1,y
-            img.putpixel((x,y), img.getpixel((x+1,y)))
+        self.fill_seams(img, [(3,4), (7,2), (11,0)], [(13,23), (17,21), (21,19)])
 
         return img
 
@@ -673,15 +1172,7 @@ class Textures(object):
 
         # plain slab
         top = self.transform_image_top(top)
-        side = self.transform_image_side(side)
-        otherside = side.transpose(Image.FLIP_LEFT_RIGHT)
-
-        sidealpha = side.split()[3]
-        side = ImageEnhance.Brightness(side).enhance(0.9)
-        side.putalpha(sidealpha)
-        othersidealpha = otherside.split()[3]
-        otherside = ImageEnhance.Brightness(otherside).enhance(0.8)
-        otherside.putalpha(othersidealpha)
+        side, otherside = self.build_sides(side)
 
         # upside down slab
         delta = 0
@@ -696,19 +1187,9 @@ class Textures(object):
         # Manually touch up 6 pixels that leave a gap because of how the
         # shearing works out. This makes the blocks perfectly tessellate-able
         if upper:
-            for x,y in [(3,4), (7,2), (11,0)]:
-                # Copy a pixel to x,y from x+1,y
-                img.putpixel((x,y), img.getpixel((x+1,y)))
-            for x,y in [(13,17), (17,15), (21,13)]:
-                # Copy a pixel to x,y from x-1,y
-                img.putpixel((x,y), img.getpixel((x-1,y)))
+            self.fill_seams(img, [(3,4), (7,2), (11,0)], [(13,17), (17,15), (21,13)])
         else:
-            for x,y in [(3,10), (7,8), (11,6)]:
-                # Copy a pixel to x,y from x+1,y
-                img.putpixel((x,y), img.getpixel((x+1,y)))
-            for x,y in [(13,23), (17,21), (21,19)]:
-                # Copy a pixel to x,y from x-1,y
-                img.putpixel((x,y), img.getpixel((x-1,y)))
+            self.fill_seams(img, [(3,10), (7,8), (11,6)], [(13,23), (17,21), (21,19)])
 
         return img
 
@@ -740,41 +1221,28 @@ class Textures(object):
             increment = int(round((top[1] / 16.)*12.)) # range increment in the block height in pixels (half texture size)
             crop_height = increment
             top = top[0]
-            if side1 is not None:
-                side1 = side1.copy()
-                ImageDraw.Draw(side1).rectangle((0, 0,16,crop_height),outline=(0,0,0,0),fill=(0,0,0,0))
-            if side2 is not None:
-                side2 = side2.copy()
-                ImageDraw.Draw(side2).rectangle((0, 0,16,crop_height),outline=(0,0,0,0),fill=(0,0,0,0))
-            if side3 is not None:
-                side3 = side3.copy()
-                ImageDraw.Draw(side3).rectangle((0, 0,16,crop_height),outline=(0,0,0,0),fill=(0,0,0,0))
-            if side4 is not None:
-                side4 = side4.copy()
-                ImageDraw.Draw(side4).rectangle((0, 0,16,crop_height),outline=(0,0,0,0),fill=(0,0,0,0))
+
+            # clear the rows above the top from the sides. The textures are
+            # shared, so do that on copies.
+            def crop_side(side):
+                if side is None:
+                    return None
+                side = side.copy()
+                side.paste((0, 0, 0, 0), (0, 0, 16, crop_height + 1))
+                return side
+            side1, side2, side3, side4 = map(crop_side, (side1, side2, side3, side4))
 
         img = Image.new("RGBA", (24,24), self.bgcolor)
 
         # first back sides
         if side1 is not None :
-            side1 = self.transform_image_side(side1)
-            side1 = side1.transpose(Image.FLIP_LEFT_RIGHT)
-
-            # Darken this side.
-            sidealpha = side1.split()[3]
-            side1 = ImageEnhance.Brightness(side1).enhance(0.9)
-            side1.putalpha(sidealpha)        
+            side1 = self.shade_side(side1, 0.9, flip=True)
 
             alpha_over(img, side1, (0,0), side1)
 
 
         if side2 is not None :
-            side2 = self.transform_image_side(side2)
-
-            # Darken this side.
-            sidealpha2 = side2.split()[3]
-            side2 = ImageEnhance.Brightness(side2).enhance(0.8)
-            side2.putalpha(sidealpha2)
+            side2 = self.shade_side(side2, 0.8)
 
             alpha_over(img, side2, (12,0), side2)
 
@@ -784,23 +1252,12 @@ class Textures(object):
 
         # front sides
         if side3 is not None :
-            side3 = self.transform_image_side(side3)
-
-            # Darken this side
-            sidealpha = side3.split()[3]
-            side3 = ImageEnhance.Brightness(side3).enhance(0.9)
-            side3.putalpha(sidealpha)
+            side3 = self.shade_side(side3, 0.9)
 
             alpha_over(img, side3, (0,6), side3)
 
         if side4 is not None :
-            side4 = self.transform_image_side(side4)
-            side4 = side4.transpose(Image.FLIP_LEFT_RIGHT)
-
-            # Darken this side
-            sidealpha = side4.split()[3]
-            side4 = ImageEnhance.Brightness(side4).enhance(0.8)
-            side4.putalpha(sidealpha)
+            side4 = self.shade_side(side4, 0.8, flip=True)
 
             alpha_over(img, side4, (12,6), side4)
 
@@ -810,12 +1267,7 @@ class Textures(object):
 
         # Manually touch up 6 pixels that leave a gap because of how the
         # shearing works out. This makes the blocks perfectly tessellate-able
-        for x,y in [(13,23), (17,21), (21,19)]:
-            # Copy a pixel to x,y from x-1,y
-            img.putpixel((x,y), img.getpixel((x-1,y)))
-        for x,y in [(3,4), (7,2), (11,0)]:
-            # Copy a pixel to x,y from x+1,y
-            img.putpixel((x,y), img.getpixel((x+1,y)))
+        self.fill_seams(img, [(3,4), (7,2), (11,0)], [(13,23), (17,21), (21,19)])
 
         return img
 
@@ -837,7 +1289,7 @@ class Textures(object):
         """
         img = Image.new("RGBA", (24,24), self.bgcolor)
 
-        front = tex.resize((14, 12), Image.ANTIALIAS)
+        front = shrink_face(tex, (14, 12))
         alpha_over(img, front, (5,9))
         return img
 
@@ -846,14 +1298,18 @@ class Textures(object):
         (used for lighting the block) that deprecates values of alpha
         smallers than 50, and sets every other value to 255. """
 
-        alpha = img.split()[3]
-        return alpha.point(lambda a: int(min(a, 25.5) * 10))
+        alpha = img.getchannel('A')
+        return alpha.point(OPAQUE_MASK_LUT)
 
     def tint_texture(self, im, c):
-        # apparently converting to grayscale drops the alpha channel?
-        i = ImageOps.colorize(ImageOps.grayscale(im), (0,0,0), c)
-        i.putalpha(im.split()[3]); # copy the alpha band back in. assuming RGBA
-        return i
+        # the same as ImageOps.colorize(ImageOps.grayscale(im), (0,0,0), c),
+        # which maps gray level g to g * c // 255, done in one go with
+        # numpy. the alpha band is copied back in, assuming RGBA
+        gray = numpy.asarray(ImageOps.grayscale(im), dtype=numpy.uint16)
+        i = numpy.empty(gray.shape + (4,), dtype=numpy.uint8)
+        i[..., :3] = gray[..., None] * numpy.array(c, dtype=numpy.uint16) // 255
+        i[..., 3] = numpy.asarray(im.getchannel('A'))
+        return Image.fromarray(i, 'RGBA')
 
     def generate_texture_tuple(self, img):
         """ This takes an image and returns the needed tuple for the
@@ -867,8 +1323,14 @@ class Textures(object):
     #
 
     models = {}
+    # generate() builds blocks from several threads at once
+    models_lock = threading.RLock()
 
     def load_model(self, modelname):
+        with self.models_lock:
+            return self._load_model(modelname)
+
+    def _load_model(self, modelname):
         if modelname in self.models:
             return self.models[modelname]
 
@@ -878,7 +1340,7 @@ class Textures(object):
         fileobj.close()
 
         if 'parent' in self.models[modelname]:
-            parent = self.load_model(re.sub('.*:', '', self.models[modelname]['parent']))
+            parent = self._load_model(self.models[modelname]['parent'].rpartition(':')[2])
             if 'textures' in parent:
                 self.models[modelname]['textures'].update(parent['textures'])
             if 'elements' in parent:
@@ -888,34 +1350,42 @@ class Textures(object):
                     self.models[modelname]['elements'] = parent['elements']
             del self.models[modelname]['parent']
 
-        self.models[modelname] = self.normalize_model(modelname)
-        return self.models[modelname]
+        model = self.models[modelname] = self.normalize_model(modelname)
+
+        # sort the elements in the order build_block_from_model() draws them.
+        # This makes a new list, as the old one may be shared with a parent.
+        if 'elements' in model:
+            model['elements'] = sorted(model['elements'], key=lambda x: (x['to'][1], 16 - (x['from'][0]+x['to'][0]),16 - (x['from'][2]+x['to'][2])))
+        return model
 
     # fix known inconsistencies in model info
     def normalize_model(self, modelname):
-        if modelname == 'block/observer':
-            self.models[modelname] = deepcopy(self.models[modelname])
-            self.models[modelname]['elements'][0]['faces']['up']['uv'] = [0, 0, 16, 16]
-        elif modelname == 'block/loom':
-            self.models[modelname] = deepcopy(self.models[modelname])
-            self.models[modelname]['elements'][0]['faces']['up']['texturerotation'] = 180
-            self.models[modelname]['elements'][0]['faces']['down']['texturerotation'] = 180
-        elif modelname == 'block/barrel' or modelname == 'block/barrel_open':
+        fix = MODEL_FIXES.get(modelname)
+        if fix is not None:
+            # the model may share its elements with its parent, so fix a copy
             self.models[modelname] = deepcopy(self.models[modelname])
-            self.models[modelname]['elements'][0]['faces']['north']['texture'] = '#up'
-            self.models[modelname]['elements'][0]['faces']['south']['texture'] = '#down'
-            self.models[modelname]['elements'][0]['faces']['down']['texture'] = '#north'
-            self.models[modelname]['elements'][0]['faces']['up']['texture'] = '#south'
-            self.models[modelname]['elements'][0]['faces']['east']['texturerotation'] = 90
-            self.models[modelname]['elements'][0]['faces']['west']['texturerotation'] = 90
-        elif modelname == 'block/dropper_vertical' or modelname == 'block/dispenser_vertical':
-            self.models[modelname] = deepcopy(self.models[modelname])
-            self.models[modelname]['elements'][0]['faces']['north']['texture'] = '#up'
-            self.models[modelname]['elements'][0]['faces']['up']['texture'] = '#north'
+            fix(self.models[modelname])
 
         return self.models[modelname]
 
     def build_block_from_model(self, modelname, blockstate={}):
+        """Builds a block image from the json model named modelname, for a
+        block in the given state. Returns a 24x24 image, or None if the model
+        has no elements to draw.
+
+        Lots of blocks share their models, so the results are cached by model
+        and block state. Callers get their own copy to draw on.
+        """
+        key = (modelname, tuple(sorted(blockstate.items())))
+        try:
+            img = self.model_block_cache[key]
+        except KeyError:
+            img = self.model_block_cache[key] = self._build_block_from_model(modelname, blockstate)
+        if img is None:
+            return None
+        return img.copy()
+
+    def _build_block_from_model(self, modelname, blockstate):
         modelname = 'block/' + modelname
 
         colmodel = self.load_model(modelname)
@@ -923,13 +1393,10 @@ class Textures(object):
         if 'elements' not in colmodel:
             return None
 
-        elements = colmodel['elements']
-        elements.sort(key=lambda x: (x['to'][1], 16 - (x['from'][0]+x['to'][0]),16 - (x['from'][2]+x['to'][2])))
-
         img = Image.new("RGBA", (24, 24), self.bgcolor)
 
-        # for each elements
-        for elem in elements:
+        # for each elements, already sorted back to front by load_model()
+        for elem in colmodel['elements']:
             try:
                 if 'west' in elem['faces']:
                     self.draw_blockface(img, elem, colmodel, blockstate, modelname, 'west')
@@ -950,12 +1417,7 @@ class Textures(object):
 
         # Manually touch up 6 pixels that leave a gap because of how the
         # shearing works out. This makes the blocks perfectly tessellate-able
-        for x, y in [(13, 23), (17, 21), (21, 19)]:
-            # Copy a pixel to x,y from x-1,y
-            img.putpixel((x, y), img.getpixel((x - 1, y)))
-        for x, y in [(3, 4), (7, 2), (11, 0)]:
-            # Copy a pixel to x,y from x+1,y
-            img.putpixel((x, y), img.getpixel((x + 1, y)))
+        self.fill_seams(img, [(3,4), (7,2), (11,0)], [(13,23), (17,21), (21,19)])
 
         return img
 
@@ -966,15 +1428,13 @@ class Textures(object):
             facing = self.map_axis_to_real(blockstate['axis'], direction)
         else:
             facing = direction
-        texture = self.build_texture(direction, elem, colmodel, blockstate, modelname, facing)
+        texture = self.build_texture(direction, elem, blockstate, modelname, facing)
         alpha_over(img, texture, self.image_pos(direction, elem, facing, modelname), texture)
 
     def image_pos(self, elementdirection, element, facing, modelname):
 
-        if elementdirection == 'east':
-            return (0, 0)
-        elif elementdirection == 'south':
-            return (12, 0)
+        if elementdirection in FACE_POSITIONS:
+            return FACE_POSITIONS[elementdirection]
         elif elementdirection == 'west':
             setback = 16 - self.setback(element, facing)
             toya = int(math.ceil(12/16 * (setback)))
@@ -997,72 +1457,50 @@ class Textures(object):
             return (0, toy)
 
     def setback(self, element, facing):
-        return {'up': 16, 'down': 0,
-                    'north': element['from'][2], 'south': 16 - element['to'][2],
-                    'east': 16 - element['to'][0], 'west': element['from'][0]}[facing]
+        if facing == 'north':
+            return element['from'][2]
+        elif facing == 'south':
+            return 16 - element['to'][2]
+        elif facing == 'east':
+            return 16 - element['to'][0]
+        elif facing == 'west':
+            return element['from'][0]
+        return SETBACK_FACES[facing]
 
     def numvalue_orientation(self, orientation):
-        return {'south': 0, 'west': 1, 'north': 2, 'east': 3, 'up': 4, 'down': 6}[orientation]
+        return ORIENTATION_VALUES[orientation]
         
     def orientation_from_numvalue(self, orientation):
-        return {0: 'south', 1: 'west', 2: 'north', 3: 'east', 4: 'up', 6: 'down'}[orientation]
+        return VALUE_ORIENTATIONS[orientation]
         
     # translates rotation to real face value
     # facing is the blockproperty
     # targetfacing is the direction in witch the north is rotated
     def map_facing_to_real(self, blockfacing, targetblockface):
-        resultface = blockfacing
-        if blockfacing == 'up':
-            if targetblockface == 'up':
-                resultface = 'north'
-            elif targetblockface == 'north':
-                resultface = 'west'
-            elif targetblockface == 'west':
-                resultface = 'down'
-        elif blockfacing == 'down':
-            if targetblockface == 'west':
-                resultface = 'down'
-            elif targetblockface == 'north':
-                resultface = 'west'
-            elif targetblockface == 'up':
-                resultface = 'south'
-        elif targetblockface == 'up':
-            resultface = 'up'
-        elif targetblockface == 'down':
-            resultface = 'down'
-        else:
-            resultface = self.orientation_from_numvalue((self.numvalue_orientation(
-                targetblockface) + [0, 3, 2, 1][self.numvalue_orientation(blockfacing)] + 1 + self.rotation + (self.rotation % 2) * 2) % 4)
-        return resultface
+        return FACING_TO_REAL[self.rotation][blockfacing, targetblockface]
 
     def map_axis_to_real(self, axis, textureface):
-        if axis == 'x':
-            return {'up': 'north', 'north': 'down', 'down': 'south', 'south': 'up', 'east': 'east', 'west': 'west'}[textureface]
-        elif axis == 'z':
-            return {'up': 'west', 'west': 'down', 'down': 'east', 'east': 'up', 'north': 'north', 'south': 'south'}[textureface]
+        if axis in AXIS_FACES:
+            return AXIS_FACES[axis][textureface]
         else:
             return textureface
 
-    def axis_rotation(self, axis, face, texture):
-        if axis == 'x':
-            rotation = {'up': 270, 'north': 0, 'down': 0,
-                        'south': 0, 'east': 270, 'west': 270}[face]
-            return texture.rotate(rotation)
-        elif axis == 'z':
-            rotation = {'up': 0, 'west': 0, 'down': 0,
-                        'east': 0, 'north': 90, 'south': 90}[face]
-            return texture.rotate(rotation)
+    def axis_rotation(self, axis, face):
+        if axis in AXIS_ROTATIONS:
+            return AXIS_ROTATIONS[axis][face]
         else:
-            return texture
+            return 0
         
-    def build_texture(self, direction, elem, data, blockstate, modelname, textureface):   
+    def build_texture(self, direction, elem, blockstate, modelname, textureface):   
 
-        texture = self.find_texture_from_model(
-            elem['faces'][textureface]['texture'], data['textures']).copy()
+        texture = self.find_texture_from_model(elem['faces'][textureface]['texture'], modelname)
 
+        # all rotations are multiples of 90 degrees, so add them up and
+        # rotate once. This also makes the copy that is cropped below.
+        rotation = self.texture_rotation(direction, blockstate, elem['faces'][textureface])
         if 'axis' in blockstate:
-            texture = self.axis_rotation(blockstate['axis'], direction, texture)
-        texture = self.texture_rotation(direction, texture, blockstate, elem['faces'][textureface], modelname)
+            rotation += self.axis_rotation(blockstate['axis'], direction)
+        texture = rotate_square(texture, rotation)
             
         if 'from' in elem and 'to' in elem and (elem['from'] != [0,0,0] or elem['to'] != [16,16,16]):
             area = [0,0,16,16]
@@ -1112,39 +1550,40 @@ class Textures(object):
         if area == [ 0, 0, 16, 16 ]:
             return img
 
+        # the rectangles to clear, including their right and bottom edges
+        boxes = []
+
         # cut from top
         if area[3] != 16:
-            ImageDraw.Draw(img).rectangle((0, 0, 16, 16 - area[3]-1), outline=(0, 0, 0, 0), fill=(0, 0, 0, 0))
+            boxes.append((0, 0, 16, 16 - area[3]-1))
 
         # cut from bottom
         if area[1] != 0:
-            ImageDraw.Draw(img).rectangle((0, 16 - (area[1]-2), 16, 16), outline=(0, 0, 0, 0), fill=(0, 0, 0, 0))
-        
+            boxes.append((0, 16 - (area[1]-2), 16, 16))
+
         # cut from right
         if area[2] != 16:
-            ImageDraw.Draw(img).rectangle((area[2]-1, 0, 16, 16), outline=(0, 0, 0, 0), fill=(0, 0, 0, 0))
-        
+            boxes.append((area[2]-1, 0, 16, 16))
+
         # cut from left
         if area[0] != 0:
-            ImageDraw.Draw(img).rectangle((0, 0, area[0]-2, 16), outline=(0, 0, 0, 0), fill=(0, 0, 0, 0))
-        
+            boxes.append((0, 0, area[0]-2, 16))
+
+        # clear them the same way ImageDraw would draw them: coordinates
+        # truncated to ints, and swapped if they're backwards
+        for box in boxes:
+            x0, x1 = sorted((int(box[0]), int(box[2])))
+            y0, y1 = sorted((int(box[1]), int(box[3])))
+            img.paste((0, 0, 0, 0), (max(x0, 0), max(y0, 0), max(x1 + 1, 0), max(y1 + 1, 0)))
         return img
 
     def adjust_lighting(self, direction, texture):
-        if direction in {'south', 'west'}:
-            sidealpha = texture.split()[3]
-            texture = ImageEnhance.Brightness(texture).enhance(0.8)
-            texture.putalpha(sidealpha)
-            return texture
-        elif direction in {'north', 'east'}:
-            sidealpha = texture.split()[3]
-            texture = ImageEnhance.Brightness(texture).enhance(0.9)
-            texture.putalpha(sidealpha)
-            return texture
-        else:
+        factor = FACE_LIGHTING.get(direction)
+        if factor is None:
             return texture
+        return self.darken(texture, factor)
 
-    def texture_rotation(self, direction, texture, blockstate, faceinfo, modelname):
+    def texture_rotation(self, direction, blockstate, faceinfo):
         rotation = 0
         if 'texturerotation' in faceinfo:
             rotation += faceinfo['texturerotation']
@@ -1166,7 +1605,7 @@ class Textures(object):
             if 'facing' in blockstate and blockstate['facing'] in {'up', 'down'}:
                 rotation += [180, 0][({'up': 0, 'down': 1}[blockstate['facing']])]
         
-        return texture.rotate(rotation % 360)
+        return rotation
 
     def transform_texture(self, direction, texture, blockstate, faceinfo):
         
@@ -1181,11 +1620,27 @@ class Textures(object):
         
         return texture
 
-    def find_texture_from_model(self, face, textureset):
+    def find_texture_from_model(self, face, modelname):
+        return self.load_image_texture(self.texture_file_from_model(face, modelname))
+
+    def texture_file_from_model(self, face, modelname):
+        """Returns the file name of the texture that face, a texture of the
+        model named modelname, refers to. Faces can refer to other textures of
+        the model with #name, so where they end up is cached.
+        """
+        key = (modelname, face)
+        try:
+            return self.model_texture_files[key]
+        except KeyError:
+            pass
+
         if face.startswith('#'):
-            return self.find_texture_from_model(textureset[face[1:]], textureset)
+            textureset = self.load_model(modelname)['textures']
+            filename = self.texture_file_from_model(textureset[face[1:]], modelname)
         else:
-            return self.load_image_texture("assets/minecraft/textures/" + re.sub('.*:', '', face) + '.png')
+            filename = "assets/minecraft/textures/" + face.rpartition(':')[2] + '.png'
+        self.model_texture_files[key] = filename
+        return filename
     
 ##
 ## The other big one: @material and associated framework
@@ -1212,11 +1667,6 @@ def material(blockid=[], data=[0], **kwargs):
         global blockmap_generators
         global max_data, max_blockid
 
-        # create a wrapper function with a known signature
-        @functools.wraps(func)
-        def func_wrapper(texobj, blockid, data):
-            return func(texobj, blockid, data)
-        
         used_datas.update(data)
         if max(data) >= max_data:
             max_data = max(data) + 1
@@ -1234,11 +1684,13 @@ def material(blockid=[], data=[0], **kwargs):
                     if kwargs.get(prop, False):
                         properties[prop].update([block])
 
-            # populate blockmap_generators with our function
+            # populate blockmap_generators with our function. generate()
+            # calls it as func(texobj, blockid, data), so it's registered
+            # as it is, without a wrapper around it
             for d in data:
-                blockmap_generators[(block, d)] = func_wrapper
+                blockmap_generators[(block, d)] = func
         
-        return func_wrapper
+        return func
     return inner_material
 
 
@@ -1288,20 +1740,17 @@ def unbound_models():
     global max_blockid, block_models, next_unclaimed_id
     tex = Textures()
 
+    # load_model() keeps every model it resolves, parents included, so each
+    # model file is only read and merged once here, and generate() reuses them
     models = Textures.find_models(tex)
     for model in models:
-        # determine transparency
-        
         colmodel = tex.load_model('block/' + model)
         if 'elements' not in colmodel:
             continue
-        transp = False
 
-        # for each elements
-        for elem in colmodel['elements']:
-            if 'from' in elem and 'to' in elem and (elem['from'] != [0,0,0] or elem['to'] != [16,16,16]):
-                transp = True
-                break
+        # blocks with an element smaller than a full cube are transparent
+        transp = any('from' in elem and 'to' in elem and (elem['from'] != [0,0,0] or elem['to'] != [16,16,16])
+                     for elem in colmodel['elements'])
 
         # find next unclaimed id to keep id values as low as possible
         while (next_unclaimed_id, 0) in blockmap_generators:
@@ -1364,6 +1813,21 @@ solidmodelblock(blockid=7, name='bedrock')
 # uses pseudo-ancildata found in iterate.c
 @material(blockid=[8, 9, 20, 79, 95], data=list(range(512)), fluid=(8, 9), transparent=True, nospawn=True, solid=(79, 20, 95))
 def no_inner_surfaces(self, blockid, data):
+    # only the top and the two front faces are ever drawn, so most of the
+    # face hiding bits (and the color bits, except for stained glass) make
+    # no difference. Draw each look only once
+    if blockid == 8 or blockid == 9:
+        data &= 0b10110
+    else:
+        data &= (0x0f if blockid == 95 else 0) | 0b10110 << 4
+    key = ('no inner surfaces', blockid, data)
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_no_inner_surfaces(self, blockid, data)
+    if self.material_cache[key] is None: # nothing shown
+        return None
+    return self.material_cache[key].copy()
+
+def draw_no_inner_surfaces(self, blockid, data):
     if blockid == 8 or blockid == 9:
         texture = self.load_water()
     elif blockid == 20:
@@ -1414,130 +1878,48 @@ solidmodelblock(blockid=15, name='iron_ore')
 solidmodelblock(blockid=16, name='coal_ore')
 
 
+# the log and wood models for each block id, by the low two data bits
+wood_models = {
+    17: ['oak_log', 'spruce_log', 'birch_log', 'jungle_log'],
+    162: ['acacia_log', 'dark_oak_log'],
+    11306: ['stripped_oak_log', 'stripped_spruce_log', 'stripped_birch_log', 'stripped_jungle_log'],
+    11307: ['stripped_acacia_log', 'stripped_dark_oak_log'],
+    11308: ['oak_wood', 'spruce_wood', 'birch_wood', 'jungle_wood'],
+    11309: ['acacia_wood', 'dark_oak_wood'],
+    11310: ['stripped_oak_wood', 'stripped_spruce_wood', 'stripped_birch_wood', 'stripped_jungle_wood'],
+    11311: ['stripped_acacia_wood', 'stripped_dark_oak_wood'],
+    1008: ['warped_stem', 'stripped_warped_stem', 'crimson_stem', 'stripped_crimson_stem'],
+    1009: ['warped_hyphae', 'stripped_warped_hyphae', 'crimson_hyphae', 'stripped_crimson_hyphae'],
+    1126: ['mangrove_log', 'stripped_mangrove_log'],
+}
+
 @material(blockid=[17, 162, 11306, 11307, 11308, 11309, 11310, 11311, 1008, 1009, 1126],
           data=list(range(12)), solid=True)
 def wood(self, blockid, data):
     type = data & 3
     
-    blockstate = {}
-    blockstate['axis'] = {0: 'y', 4: 'x', 8: 'z'}[data & 12]
-
-    if blockid == 17:
-        if type == 0:
-            return self.build_block_from_model('oak_log', blockstate)
-        if type == 1:
-            return self.build_block_from_model('spruce_log', blockstate)
-        if type == 2:
-            return self.build_block_from_model('birch_log', blockstate)
-        if type == 3:
-            return self.build_block_from_model('jungle_log', blockstate)
-
-    if blockid == 162:
-        if type == 0:
-            return self.build_block_from_model('acacia_log', blockstate)
-        if type == 1:
-            return self.build_block_from_model('dark_oak_log', blockstate)
-
-    if blockid == 11306:
-        if type == 0:
-            return self.build_block_from_model('stripped_oak_log', blockstate)
-        if type == 1:
-            return self.build_block_from_model('stripped_spruce_log', blockstate)
-        if type == 2:
-            return self.build_block_from_model('stripped_birch_log', blockstate)
-        if type == 3:
-            return self.build_block_from_model('stripped_jungle_log', blockstate)
-
-    if blockid == 11307:
-        if type == 0:
-            return self.build_block_from_model('stripped_acacia_log', blockstate)
-        if type == 1:
-            return self.build_block_from_model('stripped_dark_oak_log', blockstate)
-
-    if blockid == 11308:
-        if type == 0:
-            return self.build_block_from_model('oak_wood', blockstate)
-        if type == 1:
-            return self.build_block_from_model('spruce_wood', blockstate)
-        if type == 2:
-            return self.build_block_from_model('birch_wood', blockstate)
-        if type == 3:
-            return self.build_block_from_model('jungle_wood', blockstate)
-
-    if blockid == 11309:
-        if type == 0:
-            return self.build_block_from_model('acacia_wood', blockstate)
-        if type == 1:
-            return self.build_block_from_model('dark_oak_wood', blockstate)
-
-    if blockid == 11310:
-        if type == 0:
-            return self.build_block_from_model('stripped_oak_wood', blockstate)
-        if type == 1:
-            return self.build_block_from_model('stripped_spruce_wood', blockstate)
-        if type == 2:
-            return self.build_block_from_model('stripped_birch_wood', blockstate)
-        if type == 3:
-            return self.build_block_from_model('stripped_jungle_wood', blockstate)
-            
-    if blockid == 11311:
-        if type == 0:
-            return self.build_block_from_model('stripped_acacia_wood', blockstate)
-        if type == 1:
-            return self.build_block_from_model('stripped_dark_oak_wood', blockstate)
-
-    if blockid == 1008:
-        if type == 0:
-            return self.build_block_from_model('warped_stem', blockstate)
-        if type == 1:
-            return self.build_block_from_model('stripped_warped_stem', blockstate)
-        if type == 2:
-            return self.build_block_from_model('crimson_stem', blockstate)
-        if type == 3:
-            return self.build_block_from_model('stripped_crimson_stem', blockstate)
-
-    if blockid == 1009:
-        if type == 0:
-            return self.build_block_from_model('warped_hyphae', blockstate)
-        if type == 1:
-            return self.build_block_from_model('stripped_warped_hyphae', blockstate)
-        if type == 2:
-            return self.build_block_from_model('crimson_hyphae', blockstate)
-        if type == 3:
-            return self.build_block_from_model('stripped_crimson_hyphae', blockstate)
-
-    if blockid == 1126:
-        if type == 0:
-            return self.build_block_from_model('mangrove_log', blockstate)
-        if type == 1:
-            return self.build_block_from_model('stripped_mangrove_log', blockstate)
-    
+    # bits 4 and 8 hold the axis: 0 is y, 4 is x and 8 is z
+    blockstate = {'axis': ('y', 'x', 'z')[data >> 2]}
+
+    models = wood_models[blockid]
+    if type < len(models):
+        return self.build_block_from_model(models[type], blockstate)
     return self.build_block_from_model('oak_log', blockstate)
 
 
+# the leaves models by block id and the low three data bits
+leaves_models = {
+    (18, 0): "oak_leaves", (18, 1): "spruce_leaves", (18, 2): "birch_leaves", (18, 3): "jungle_leaves",
+    (161, 4): "acacia_leaves", (161, 5): "dark_oak_leaves",
+    (18, 6): "flowering_azalea_leaves", (18, 7): "azalea_leaves",
+}
+
 @material(blockid=[18, 161], data=list(range(16)), transparent=True, solid=True)
 def leaves(self, blockid, data):
     # mask out the bits 4 and 8
     # they are used for player placed and check-for-decay blocks
     data = data & 0x7
-    if (blockid, data) == (18, 0):
-        return self.build_block_from_model("oak_leaves")
-    elif (blockid, data) == (18, 1):
-        return self.build_block_from_model("spruce_leaves")
-    elif (blockid, data) == (18, 2):
-        return self.build_block_from_model("birch_leaves")
-    elif (blockid, data) == (18, 3):
-        return self.build_block_from_model("jungle_leaves")
-    elif (blockid, data) == (161, 4):
-        return self.build_block_from_model("acacia_leaves")
-    elif (blockid, data) == (161, 5): 
-        return self.build_block_from_model("dark_oak_leaves")
-    elif (blockid, data) == (18, 6):
-        return self.build_block_from_model("flowering_azalea_leaves")
-    elif (blockid, data) == (18, 7):
-        return self.build_block_from_model("azalea_leaves")
-    else:
-        return self.build_block_from_model("mangrove_leaves")
+    return self.build_block_from_model(leaves_models.get((blockid, data), "mangrove_leaves"))
     
 
 @material(blockid=19, data=list(range(2)), solid=True)
@@ -1556,16 +1938,12 @@ solidmodelblock(blockid=22, name="lapis_block")
 
 @material(blockid=[23, 158], data=list(range(6)), solid=True)
 def dropper(self, blockid, data):
-    facing = {0: 'down', 1: 'up', 2: 'north', 3: 'south', 4: 'west', 5: 'east'}[data]
+    facing = ('down', 'up', 'north', 'south', 'west', 'east')[data]
 
-    if blockid == 158:
-        if data in {0, 1}:
-            return self.build_block_from_model('dropper_vertical', {'facing': facing})
-        return self.build_block_from_model('dropper', {'facing': facing})
-    if blockid == 23:
-        if data in {0, 1}:
-            return self.build_block_from_model('dispenser_vertical', {'facing': facing})
-        return self.build_block_from_model('dispenser', {'facing': facing})
+    model = {23: 'dispenser', 158: 'dropper'}[blockid]
+    if data in {0, 1}:
+        model += '_vertical'
+    return self.build_block_from_model(model, {'facing': facing})
 
 # furnace, blast furnace, and smoker
 @material(blockid=[61, 11362, 11364], data=list(range(14)), solid=True)
@@ -1573,19 +1951,11 @@ def furnaces(self, blockid, data):
     lit = data & 0b1000 == 8
     oriention = data & 0b111
 
-    facing = {0: '', 1: '', 2: 'north', 3: 'south', 4: 'west', 5: 'east', 6: '', 7: ''}[oriention]
-    if blockid == 61:
-        if lit:
-            return self.build_block_from_model('furnace_on', {'facing': facing})
-        return self.build_block_from_model('furnace', {'facing': facing})
-    if blockid == 11362:
-        if lit:
-            return self.build_block_from_model('blast_furnace_on', {'facing': facing})
-        return self.build_block_from_model('blast_furnace', {'facing': facing})
-    if blockid == 11364:
-        if lit:
-            return self.build_block_from_model('smoker_on', {'facing': facing})
-        return self.build_block_from_model('smoker', {'facing': facing})
+    facing = ('', '', 'north', 'south', 'west', 'east', '', '')[oriention]
+    model = {61: 'furnace', 11362: 'blast_furnace', 11364: 'smoker'}[blockid]
+    if lit:
+        model += '_on'
+    return self.build_block_from_model(model, {'facing': facing})
 
 # Bed
 @material(blockid=26, data=list(range(256)), transparent=True, nospawn=True)
@@ -1599,74 +1969,90 @@ def bed(self, blockid, data):
     # Masked to not clobber block head/foot & color info
     data = data & 0b11111100 | ((self.rotation + (data & 0b11)) % 4)
 
+    # occupied beds look the same, so each bed is only drawn once
+    key = ('bed', data & 0b11111011)
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_bed(self, data)
+    return self.material_cache[key].copy()
+
+# how far the top of a bed is rotated, and which parts go on its left and
+# right faces, by the head bit and the rotated direction in the data value
+bed_faces = {
+    # foot of the bed
+    0b0000: (180, 'flipped side', None),    # South
+    0b0001: (90, None, 'flipped side'),     # West
+    0b0010: (0, 'side', 'end'),             # North
+    0b0011: (270, 'end', 'side'),           # East
+    # head of the bed
+    0b1000: (180, 'flipped side', 'end'),   # South
+    0b1001: (90, 'end', 'flipped side'),    # West
+    0b1010: (0, 'side', None),              # North
+    0b1011: (270, None, 'side'),            # East
+}
+
+# draws the bed for data, with the rotation already applied
+def draw_bed(self, data):
+    # the parts only depend on the color and on which end of the bed this
+    # is, so they are shared between the four rotations
+    key = ('bed parts', data >> 3)
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_bed_parts(self, data)
+    top, faces = self.material_cache[key]
+
+    top_rotation, left, right = bed_faces[data & 0b1011]
+    top_face = (rotate_square(top, top_rotation), 8)
+    return self.build_full_block(top_face, None, None, faces[left], faces[right])
+
+# composes the top texture of the head or foot of a bed, and the textures
+# for its faces by the names used in bed_faces
+def draw_bed_parts(self, data):
     bed_texture = self.load_image("assets/minecraft/textures/entity/bed/%s.png" % color_map[data >> 4])
-    increment = 8
-    left_face = None
-    right_face = None
-    top_face = None
     if data & 0x8 == 0x8:  # head of the bed
-        top = bed_texture.copy().crop((6, 6, 22, 22))
+        top = bed_texture.crop((6, 6, 22, 22))
 
         # Composing the side
         side = Image.new("RGBA", (16, 16), self.bgcolor)
-        side_part1 = bed_texture.copy().crop((0, 6, 6, 22)).rotate(90, expand=True)
+        side_part1 = bed_texture.crop((0, 6, 6, 22)).transpose(Image.ROTATE_90)
         # foot of the bed
-        side_part2 = bed_texture.copy().crop((53, 3, 56, 6))
+        side_part2 = bed_texture.crop((53, 3, 56, 6))
         side_part2_f = side_part2.transpose(Image.FLIP_LEFT_RIGHT)
         alpha_over(side, side_part1, (0, 7), side_part1)
         alpha_over(side, side_part2, (0, 13), side_part2)
 
         end = Image.new("RGBA", (16, 16), self.bgcolor)
-        end_part = bed_texture.copy().crop((6, 0, 22, 6)).rotate(180)
+        end_part = bed_texture.crop((6, 0, 22, 6)).transpose(Image.ROTATE_180)
         alpha_over(end, end_part, (0, 7), end_part)
         alpha_over(end, side_part2, (0, 13), side_part2)
         alpha_over(end, side_part2_f, (13, 13), side_part2_f)
-        if data & 0x03 == 0x00:    # South
-            top_face = top.rotate(180)
-            left_face = side.transpose(Image.FLIP_LEFT_RIGHT)
-            right_face = end
-        elif data & 0x03 == 0x01:  # West
-            top_face = top.rotate(90)
-            left_face = end
-            right_face = side.transpose(Image.FLIP_LEFT_RIGHT)
-        elif data & 0x03 == 0x02:  # North
-            top_face = top
-            left_face = side
-        elif data & 0x03 == 0x03:  # East
-            top_face = top.rotate(270)
-            right_face = side
 
     else:  # foot of the bed
-        top = bed_texture.copy().crop((6, 28, 22, 44))
+        top = bed_texture.crop((6, 28, 22, 44))
         side = Image.new("RGBA", (16, 16), self.bgcolor)
-        side_part1 = bed_texture.copy().crop((0, 28, 6, 44)).rotate(90, expand=True)
-        side_part2 = bed_texture.copy().crop((53, 3, 56, 6))
+        side_part1 = bed_texture.crop((0, 28, 6, 44)).transpose(Image.ROTATE_90)
+        side_part2 = bed_texture.crop((53, 3, 56, 6))
         side_part2_f = side_part2.transpose(Image.FLIP_LEFT_RIGHT)
         alpha_over(side, side_part1, (0, 7), side_part1)
         alpha_over(side, side_part2, (13, 13), side_part2)
 
         end = Image.new("RGBA", (16, 16), self.bgcolor)
-        end_part = bed_texture.copy().crop((22, 22, 38, 28)).rotate(180)
+        end_part = bed_texture.crop((22, 22, 38, 28)).transpose(Image.ROTATE_180)
         alpha_over(end, end_part, (0, 7), end_part)
         alpha_over(end, side_part2, (0, 13), side_part2)
         alpha_over(end, side_part2_f, (13, 13), side_part2_f)
-        if data & 0x03 == 0x00:    # South
-            top_face = top.rotate(180)
-            left_face = side.transpose(Image.FLIP_LEFT_RIGHT)
-        elif data & 0x03 == 0x01:  # West
-            top_face = top.rotate(90)
-            right_face = side.transpose(Image.FLIP_LEFT_RIGHT)
-        elif data & 0x03 == 0x02:  # North
-            top_face = top
-            left_face = side
-            right_face = end
-        elif data & 0x03 == 0x03:  # East
-            top_face = top.rotate(270)
-            left_face = end
-            right_face = side
-
-    top_face = (top_face, increment)
-    return self.build_full_block(top_face, None, None, left_face, right_face)
+
+    faces = {'side': side, 'flipped side': side.transpose(Image.FLIP_LEFT_RIGHT), 'end': end, None: None}
+    return top, faces
+
+# the rotated rail shapes for every map rotation, by the low three data
+# bits, and for the corners of normal rails by the whole data value
+rail_rotations = [[0, 1, 2, 3, 4, 5, 6, 7],
+                  [1, 0, 5, 4, 2, 3, 6, 7],
+                  [0, 1, 3, 2, 5, 4, 6, 7],
+                  [1, 0, 4, 5, 3, 2, 6, 7]]
+rail_corner_rotations = [{},
+                         {6: 7, 7: 8, 8: 6},
+                         {6: 8, 7: 9, 8: 6, 9: 7},
+                         {6: 9, 7: 6, 9: 7}]
 
 # powered, detector, activator and normal rails
 @material(blockid=[27, 28, 66, 157], data=list(range(14)), transparent=True)
@@ -1674,43 +2060,11 @@ def rails(self, blockid, data):
     # first, do rotation
     # Masked to not clobber powered rail on/off info
     # Ascending and flat straight
-    if self.rotation == 1:
-        if (data & 0b0111) == 0: data = data & 0b1000 | 1
-        elif (data & 0b0111) == 1: data = data & 0b1000 | 0
-        elif (data & 0b0111) == 2: data = data & 0b1000 | 5
-        elif (data & 0b0111) == 3: data = data & 0b1000 | 4
-        elif (data & 0b0111) == 4: data = data & 0b1000 | 2
-        elif (data & 0b0111) == 5: data = data & 0b1000 | 3
-    elif self.rotation == 2:
-        if (data & 0b0111) == 2: data = data & 0b1000 | 3
-        elif (data & 0b0111) == 3: data = data & 0b1000 | 2
-        elif (data & 0b0111) == 4: data = data & 0b1000 | 5
-        elif (data & 0b0111) == 5: data = data & 0b1000 | 4
-    elif self.rotation == 3:
-        if (data & 0b0111) == 0: data = data & 0b1000 | 1
-        elif (data & 0b0111) == 1: data = data & 0b1000 | 0
-        elif (data & 0b0111) == 2: data = data & 0b1000 | 4
-        elif (data & 0b0111) == 3: data = data & 0b1000 | 5
-        elif (data & 0b0111) == 4: data = data & 0b1000 | 3
-        elif (data & 0b0111) == 5: data = data & 0b1000 | 2
+    data = data & 0b1000 | rail_rotations[self.rotation][data & 0b0111]
     if blockid == 66: # normal minetrack only
         #Corners
-        if self.rotation == 1:
-            if data == 6: data = 7
-            elif data == 7: data = 8
-            elif data == 8: data = 6
-            elif data == 9: data = 9
-        elif self.rotation == 2:
-            if data == 6: data = 8
-            elif data == 7: data = 9
-            elif data == 8: data = 6
-            elif data == 9: data = 7
-        elif self.rotation == 3:
-            if data == 6: data = 9
-            elif data == 7: data = 6
-            elif data == 8: data = 8
-            elif data == 9: data = 7
-    img = Image.new("RGBA", (24,24), self.bgcolor)
+        data = rail_corner_rotations[self.rotation].get(data, data)
+    img = blank_block(self.bgcolor).copy()
     
     if blockid == 27: # powered rail
         if data & 0x8 == 0: # unpowered
@@ -1743,6 +2097,8 @@ def rails(self, blockid, data):
         data = data & 0x7
         
     ## use transform_image to scale and shear
+    # (alpha_over() onto the blank image isn't the same as a plain paste: it
+    # leaves the background color under the transparent parts of the track)
     if data == 0:
         track = self.transform_image_top(raw_straight)
         alpha_over(img, track, (0,12), track)
@@ -1750,17 +2106,17 @@ def rails(self, blockid, data):
         track = self.transform_image_top(raw_corner)
         alpha_over(img, track, (0,12), track)
     elif data == 7:
-        track = self.transform_image_top(raw_corner.rotate(270))
+        track = self.transform_image_top(raw_corner.transpose(Image.ROTATE_270))
         alpha_over(img, track, (0,12), track)
     elif data == 8:
         # flip
-        track = self.transform_image_top(raw_corner.transpose(Image.FLIP_TOP_BOTTOM).rotate(90))
+        track = self.transform_image_top(raw_corner.transpose(Image.FLIP_TOP_BOTTOM).transpose(Image.ROTATE_90))
         alpha_over(img, track, (0,12), track)
     elif data == 9:
         track = self.transform_image_top(raw_corner.transpose(Image.FLIP_TOP_BOTTOM))
         alpha_over(img, track, (0,12), track)
     elif data == 1:
-        track = self.transform_image_top(raw_straight.rotate(90))
+        track = self.transform_image_top(raw_straight.transpose(Image.ROTATE_90))
         alpha_over(img, track, (0,12), track)
         
     #slopes
@@ -1787,65 +2143,70 @@ def rails(self, blockid, data):
     return img
 
 
+# the rotated piston facing for every map rotation, by the low three data
+# bits. Used for both the piston body and its extension.
+piston_rotations = [[0, 1, 2, 3, 4, 5, 6, 7],
+                    [0, 1, 5, 4, 2, 3, 6, 7],
+                    [0, 1, 3, 2, 5, 4, 6, 7],
+                    [0, 1, 4, 5, 3, 2, 6, 7]]
+
 # sticky and normal piston body
 @material(blockid=[29, 33], data=[0, 1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 13],
           transparent=True, solid=True, nospawn=True)
 def piston(self, blockid, data):
     # first, rotation
     # Masked to not clobber block head/foot info
-    if self.rotation in [1, 2, 3] and (data & 0b111) in [2, 3, 4, 5]:
-        rotation_map = {1: {2: 5, 3: 4, 4: 2, 5: 3},
-                        2: {2: 3, 3: 2, 4: 5, 5: 4},
-                        3: {2: 4, 3: 5, 4: 3, 5: 2}}
-        data = (data & 0b1000) | rotation_map[self.rotation][data & 0b111]
+    data = (data & 0b1000) | piston_rotations[self.rotation][data & 0b111]
 
     if blockid == 29:  # sticky
-        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top_sticky.png").copy()
+        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top_sticky.png")
     else:  # normal
-        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top.png").copy()
+        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top.png")
 
     # other textures
-    side_t = self.load_image_texture("assets/minecraft/textures/block/piston_side.png").copy()
-    back_t = self.load_image_texture("assets/minecraft/textures/block/piston_bottom.png").copy()
-    interior_t = self.load_image_texture("assets/minecraft/textures/block/piston_inner.png").copy()
+    side_t = self.load_image_texture("assets/minecraft/textures/block/piston_side.png")
+    back_t = self.load_image_texture("assets/minecraft/textures/block/piston_bottom.png")
+    interior_t = self.load_image_texture("assets/minecraft/textures/block/piston_inner.png")
 
     if data & 0x08 == 0x08:  # pushed out, non full blocks, tricky stuff
-        # remove piston texture from piston body
+        # remove piston texture from piston body, on a copy as the texture is
+        # shared
+        side_t = side_t.copy()
         ImageDraw.Draw(side_t).rectangle((0, 0, 16, 3), outline=(0, 0, 0, 0), fill=(0, 0, 0, 0))
 
         if data & 0x07 == 0x0:    # down
-            side_t = side_t.rotate(180)
+            side_t = side_t.transpose(Image.ROTATE_180)
             img = self.build_full_block(back_t, None, None, side_t, side_t)
         elif data & 0x07 == 0x1:  # up
             img = self.build_full_block((interior_t, 4), None, None, side_t, side_t)
         elif data & 0x07 == 0x2:  # north
-            img = self.build_full_block(side_t, None, None, side_t.rotate(90), back_t)
+            img = self.build_full_block(side_t, None, None, side_t.transpose(Image.ROTATE_90), back_t)
         elif data & 0x07 == 0x3:  # south
-            img = self.build_full_block(side_t.rotate(180), None, None, side_t.rotate(270), None)
+            img = self.build_full_block(side_t.transpose(Image.ROTATE_180), None, None, side_t.transpose(Image.ROTATE_270), None)
             temp = self.transform_image_side(interior_t)
             temp = temp.transpose(Image.FLIP_LEFT_RIGHT)
             alpha_over(img, temp, (9, 4), temp)
         elif data & 0x07 == 0x4:  # west
-            img = self.build_full_block(side_t.rotate(90), None, None, None, side_t.rotate(270))
+            img = self.build_full_block(side_t.transpose(Image.ROTATE_90), None, None, None, side_t.transpose(Image.ROTATE_270))
             temp = self.transform_image_side(interior_t)
             alpha_over(img, temp, (3, 4), temp)
         elif data & 0x07 == 0x5:  # east
-            img = self.build_full_block(side_t.rotate(270), None, None, back_t, side_t.rotate(90))
+            img = self.build_full_block(side_t.transpose(Image.ROTATE_270), None, None, back_t, side_t.transpose(Image.ROTATE_90))
 
     else:  # pushed in, normal full blocks, easy stuff
         if data & 0x07 == 0x0:    # down
-            side_t = side_t.rotate(180)
+            side_t = side_t.transpose(Image.ROTATE_180)
             img = self.build_full_block(back_t, None, None, side_t, side_t)
         elif data & 0x07 == 0x1:  # up
             img = self.build_full_block(piston_t, None, None, side_t, side_t)
         elif data & 0x07 == 0x2:  # north
-            img = self.build_full_block(side_t, None, None, side_t.rotate(90), back_t)
+            img = self.build_full_block(side_t, None, None, side_t.transpose(Image.ROTATE_90), back_t)
         elif data & 0x07 == 0x3:  # south
-            img = self.build_full_block(side_t.rotate(180), None, None, side_t.rotate(270), piston_t)
+            img = self.build_full_block(side_t.transpose(Image.ROTATE_180), None, None, side_t.transpose(Image.ROTATE_270), piston_t)
         elif data & 0x07 == 0x4:  # west
-            img = self.build_full_block(side_t.rotate(90), None, None, piston_t, side_t.rotate(270))
+            img = self.build_full_block(side_t.transpose(Image.ROTATE_90), None, None, piston_t, side_t.transpose(Image.ROTATE_270))
         elif data & 0x07 == 0x5:  # east
-            img = self.build_full_block(side_t.rotate(270), None, None, back_t, side_t.rotate(90))
+            img = self.build_full_block(side_t.transpose(Image.ROTATE_270), None, None, back_t, side_t.transpose(Image.ROTATE_90))
 
     return img
 
@@ -1855,72 +2216,48 @@ def piston(self, blockid, data):
 def piston_extension(self, blockid, data):
     # first, rotation
     # Masked to not clobber block head/foot info
-    if self.rotation in [1, 2, 3] and (data & 0b111) in [2, 3, 4, 5]:
-        rotation_map = {1: {2: 5, 3: 4, 4: 2, 5: 3},
-                        2: {2: 3, 3: 2, 4: 5, 5: 4},
-                        3: {2: 4, 3: 5, 4: 3, 5: 2}}
-        data = (data & 0b1000) | rotation_map[self.rotation][data & 0b111]
+    data = (data & 0b1000) | piston_rotations[self.rotation][data & 0b111]
 
     if data & 0x8 == 0x8:  # sticky
-        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top_sticky.png").copy()
+        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top_sticky.png")
     else:  # normal
-        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top.png").copy()
-
-    # other textures
-    side_t = self.load_image_texture("assets/minecraft/textures/block/piston_side.png").copy()
-    back_t = self.load_image_texture("assets/minecraft/textures/block/piston_top.png").copy()
-    # crop piston body
-    ImageDraw.Draw(side_t).rectangle((0, 4, 16, 16), outline=(0, 0, 0, 0), fill=(0, 0, 0, 0))
+        piston_t = self.load_image_texture("assets/minecraft/textures/block/piston_top.png")
 
-    # generate the horizontal piston extension stick
-    h_stick = Image.new("RGBA", (24, 24), self.bgcolor)
-    temp = self.transform_image_side(side_t)
-    alpha_over(h_stick, temp, (1, 7), temp)
-    temp = self.transform_image_top(side_t.rotate(90))
-    alpha_over(h_stick, temp, (1, 1), temp)
-    # Darken it
-    sidealpha = h_stick.split()[3]
-    h_stick = ImageEnhance.Brightness(h_stick).enhance(0.85)
-    h_stick.putalpha(sidealpha)
-
-    # generate the vertical piston extension stick
-    v_stick = Image.new("RGBA", (24, 24), self.bgcolor)
-    temp = self.transform_image_side(side_t.rotate(90))
-    alpha_over(v_stick, temp, (12, 6), temp)
-    temp = temp.transpose(Image.FLIP_LEFT_RIGHT)
-    alpha_over(v_stick, temp, (1, 6), temp)
-    # Darken it
-    sidealpha = v_stick.split()[3]
-    v_stick = ImageEnhance.Brightness(v_stick).enhance(0.85)
-    v_stick.putalpha(sidealpha)
+    # other textures. The cropped side and the sticks are the same for every
+    # piston extension, so they are only drawn once.
+    back_t = self.load_image_texture("assets/minecraft/textures/block/piston_top.png")
+    key = ('piston sticks',)
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_piston_sticks(self)
+    side_t, h_stick, v_stick = self.material_cache[key]
 
     # Piston orientation is stored in the 3 first bits
     if data & 0x07 == 0x0:    # down
-        side_t = side_t.rotate(180)
+        side_t = side_t.transpose(Image.ROTATE_180)
         img = self.build_full_block((back_t, 12), None, None, side_t, side_t)
         alpha_over(img, v_stick, (0, -3), v_stick)
     elif data & 0x07 == 0x1:  # up
-        img = Image.new("RGBA", (24, 24), self.bgcolor)
+        img = blank_block(self.bgcolor).copy()
         img2 = self.build_full_block(piston_t, None, None, side_t, side_t)
         alpha_over(img, v_stick, (0, 4), v_stick)
         alpha_over(img, img2, (0, 0), img2)
     elif data & 0x07 == 0x2:  # north
-        img = self.build_full_block(side_t, None, None, side_t.rotate(90), None)
+        img = self.build_full_block(side_t, None, None, side_t.transpose(Image.ROTATE_90), None)
         temp = self.transform_image_side(back_t).transpose(Image.FLIP_LEFT_RIGHT)
         alpha_over(img, temp, (2, 2), temp)
         alpha_over(img, h_stick, (6, 3), h_stick)
     elif data & 0x07 == 0x3:  # south
-        img = Image.new("RGBA", (24, 24), self.bgcolor)
-        img2 = self.build_full_block(side_t.rotate(180), None, None, side_t.rotate(270), piston_t)
+        img = blank_block(self.bgcolor).copy()
+        img2 = self.build_full_block(side_t.transpose(Image.ROTATE_180), None, None, side_t.transpose(Image.ROTATE_270), piston_t)
         alpha_over(img, h_stick, (0, 0), h_stick)
         alpha_over(img, img2, (0, 0), img2)
     elif data & 0x07 == 0x4:  # west
-        img = self.build_full_block(side_t.rotate(90), None, None, piston_t, side_t.rotate(270))
+        img = self.build_full_block(side_t.transpose(Image.ROTATE_90), None, None, piston_t, side_t.transpose(Image.ROTATE_270))
         h_stick = h_stick.transpose(Image.FLIP_LEFT_RIGHT)
         alpha_over(img, h_stick, (0, 0), h_stick)
     elif data & 0x07 == 0x5:  # east
-        img = Image.new("RGBA", (24, 24), self.bgcolor)
-        img2 = self.build_full_block(side_t.rotate(270), None, None, None, side_t.rotate(90))
+        img = blank_block(self.bgcolor).copy()
+        img2 = self.build_full_block(side_t.transpose(Image.ROTATE_270), None, None, None, side_t.transpose(Image.ROTATE_90))
         h_stick = h_stick.transpose(Image.FLIP_LEFT_RIGHT)
         temp = self.transform_image_side(back_t)
         alpha_over(img2, temp, (10, 2), temp)
@@ -1930,6 +2267,34 @@ def piston_extension(self, blockid, data):
     return img
 
 
+# draws the cropped piston side and the horizontal and vertical sticks of
+# piston extensions
+def draw_piston_sticks(self):
+    side_t = self.load_image_texture("assets/minecraft/textures/block/piston_side.png").copy()
+    # crop piston body
+    ImageDraw.Draw(side_t).rectangle((0, 4, 16, 16), outline=(0, 0, 0, 0), fill=(0, 0, 0, 0))
+
+    # generate the horizontal piston extension stick
+    h_stick = Image.new("RGBA", (24, 24), self.bgcolor)
+    temp = self.transform_image_side(side_t)
+    alpha_over(h_stick, temp, (1, 7), temp)
+    temp = self.transform_image_top(side_t.transpose(Image.ROTATE_90))
+    alpha_over(h_stick, temp, (1, 1), temp)
+    # Darken it
+    h_stick = self.darken(h_stick, 0.85)
+
+    # generate the vertical piston extension stick
+    v_stick = Image.new("RGBA", (24, 24), self.bgcolor)
+    temp = self.transform_image_side(side_t.transpose(Image.ROTATE_90))
+    alpha_over(v_stick, temp, (12, 6), temp)
+    temp = temp.transpose(Image.FLIP_LEFT_RIGHT)
+    alpha_over(v_stick, temp, (1, 6), temp)
+    # Darken it
+    v_stick = self.darken(v_stick, 0.85)
+
+    return side_t, h_stick, v_stick
+
+
 # cobweb
 sprite(blockid=30, imagename="assets/minecraft/textures/block/cobweb.png", nospawn=True)
 
@@ -1951,11 +2316,12 @@ billboard(blockid=32, imagename="assets/minecraft/textures/block/dead_bush.png")
 sprite(blockid=37, imagename="assets/minecraft/textures/block/dandelion.png")
 
 # flowers
+flower_map = ["poppy", "blue_orchid", "allium", "azure_bluet", "red_tulip", "orange_tulip",
+              "white_tulip", "pink_tulip", "oxeye_daisy", "dandelion", "wither_rose",
+              "cornflower", "lily_of_the_valley"]
+
 @material(blockid=38, data=list(range(13)), transparent=True)
 def flower(self, blockid, data):
-    flower_map = ["poppy", "blue_orchid", "allium", "azure_bluet", "red_tulip", "orange_tulip",
-                  "white_tulip", "pink_tulip", "oxeye_daisy", "dandelion", "wither_rose",
-                  "cornflower", "lily_of_the_valley"]
     texture = self.load_image_texture("assets/minecraft/textures/block/%s.png" % flower_map[data])
     return self.build_billboard(texture)
 
@@ -1978,6 +2344,74 @@ solidmodelblock(blockid=41, name="gold_block")
 # block of iron
 solidmodelblock(blockid=42, name="iron_block")
 
+# the top and side textures of the slabs that come in several variants, by
+# block id and variant
+stone_slab_textures = {
+    0: ("stone", "stone"),                  # stone slab
+    1: ("sandstone_top", "sandstone"),      # sandstone slab
+    2: ("oak_planks", "oak_planks"),        # wooden slab
+    3: ("cobblestone", "cobblestone"),      # cobblestone slab
+    4: ("bricks", "bricks"),                # brick
+    5: ("stone_bricks", "stone_bricks"),    # stone brick
+    6: ("nether_bricks", "nether_bricks"),  # nether brick slab
+    7: ("quartz_block_side", "quartz_block_side"),  # quartz
+    8: ("smooth_stone", "smooth_stone"),    # special stone double slab with top texture only
+    9: ("sandstone_top", "sandstone_top"),  # special sandstone double slab with top texture only
+}
+slab_variant_textures = {
+    43: stone_slab_textures,
+    44: stone_slab_textures,
+    # single red sandstone slab
+    182: {0: ("red_sandstone_top", "red_sandstone")},
+    # double red sandstone slab, and 'full' red sandstone (smooth)
+    181: {0: ("red_sandstone_top", "red_sandstone"), 8: ("red_sandstone_top", "red_sandstone_top")},
+}
+
+# the slabs that make up a full block
+double_slabs = {43, 181, 204}
+
+# the top and side textures of all other slabs, by block id
+slab_textures = {
+    204: ("purpur_block", "purpur_block"),  # purpur slab (single=205 double=204)
+    205: ("purpur_block", "purpur_block"),
+    11340: ("prismarine", "prismarine"),
+    11341: ("dark_prismarine", "dark_prismarine"),
+    11342: ("prismarine_bricks", "prismarine_bricks"),
+    11343: ("andesite", "andesite"),
+    11344: ("diorite", "diorite"),
+    11345: ("granite", "granite"),
+    11346: ("polished_andesite", "polished_andesite"),
+    11347: ("polished_diorite", "polished_diorite"),
+    11348: ("polished_granite", "polished_granite"),
+    11349: ("red_nether_bricks", "red_nether_bricks"),
+    11350: ("sandstone_top", "sandstone_top"),  # smooth sandstone slab
+    11351: ("cut_sandstone", "cut_sandstone"),
+    11352: ("red_sandstone_top", "red_sandstone_top"),  # smooth red sandstone slab
+    11353: ("cut_red_sandstone", "cut_red_sandstone"),
+    11354: ("end_stone_bricks", "end_stone_bricks"),
+    11355: ("mossy_cobblestone", "mossy_cobblestone"),
+    11356: ("mossy_stone_bricks", "mossy_stone_bricks"),
+    11357: ("quartz_block_bottom", "quartz_block_bottom"),  # smooth quartz slab
+    11358: ("smooth_stone", "smooth_stone_slab_side"),
+    1027: ("blackstone", "blackstone"),
+    1028: ("polished_blackstone", "polished_blackstone"),
+    1029: ("polished_blackstone_bricks", "polished_blackstone_bricks"),
+    1072: ("cut_copper", "cut_copper"),
+    1073: ("exposed_cut_copper", "exposed_cut_copper"),
+    1074: ("weathered_cut_copper", "weathered_cut_copper"),
+    1075: ("oxidized_cut_copper", "oxidized_cut_copper"),
+    1076: ("cut_copper", "cut_copper"),
+    1077: ("exposed_cut_copper", "exposed_cut_copper"),
+    1078: ("weathered_cut_copper", "weathered_cut_copper"),
+    1079: ("oxidized_cut_copper", "oxidized_cut_copper"),
+    1103: ("cobbled_deepslate", "cobbled_deepslate"),
+    1104: ("polished_deepslate", "polished_deepslate"),
+    1105: ("deepslate_bricks", "deepslate_bricks"),
+    1106: ("deepslate_tiles", "deepslate_tiles"),
+    1124: ("mud_bricks", "mud_bricks"),
+    1789: ("mangrove_planks", "mangrove_planks"),
+}
+
 # double slabs and slabs
 # these wooden slabs are unobtainable without cheating, they are still
 # here because lots of pre-1.3 worlds use this blocks, add prismarine slabs
@@ -1987,126 +2421,21 @@ solidmodelblock(blockid=42, name="iron_block")
           transparent=[44, 182, 205, 1124, 1789] + list(range(11340, 11359)) + list(range(1027, 1030)) +
           list(range(1072, 1080)) + list(range(1103, 1107)), solid=True)
 def slabs(self, blockid, data):
-    if blockid == 44 or blockid == 182: 
-        texture = data & 7
-    else: # data > 8 are special double slabs
+    if blockid in double_slabs: # data > 8 are special double slabs
         texture = data
+    else: # the upper bit tells which half a single slab is in
+        texture = data & 7
 
-    if blockid == 44 or blockid == 43:
-        if texture== 0: # stone slab
-            top = self.load_image_texture("assets/minecraft/textures/block/stone.png")
-            side = self.load_image_texture("assets/minecraft/textures/block/stone.png")
-        elif texture== 1: # sandstone slab
-            top = self.load_image_texture("assets/minecraft/textures/block/sandstone_top.png")
-            side = self.load_image_texture("assets/minecraft/textures/block/sandstone.png")
-        elif texture== 2: # wooden slab
-            top = side = self.load_image_texture("assets/minecraft/textures/block/oak_planks.png")
-        elif texture== 3: # cobblestone slab
-            top = side = self.load_image_texture("assets/minecraft/textures/block/cobblestone.png")
-        elif texture== 4: # brick
-            top = side = self.load_image_texture("assets/minecraft/textures/block/bricks.png")
-        elif texture== 5: # stone brick
-            top = side = self.load_image_texture("assets/minecraft/textures/block/stone_bricks.png")
-        elif texture== 6: # nether brick slab
-            top = side = self.load_image_texture("assets/minecraft/textures/block/nether_bricks.png")
-        elif texture== 7: #quartz        
-            top = side = self.load_image_texture("assets/minecraft/textures/block/quartz_block_side.png")
-        elif texture== 8: # special stone double slab with top texture only
-            top = side = self.load_image_texture("assets/minecraft/textures/block/smooth_stone.png")
-        elif texture== 9: # special sandstone double slab with top texture only
-            top = side = self.load_image_texture("assets/minecraft/textures/block/sandstone_top.png")
-        else:
-            return None
-
-    elif blockid == 182: # single red sandstone slab
-        if texture == 0:
-            top = self.load_image_texture("assets/minecraft/textures/block/red_sandstone_top.png")
-            side = self.load_image_texture("assets/minecraft/textures/block/red_sandstone.png")
-        else:
+    if blockid in slab_variant_textures:
+        textures = slab_variant_textures[blockid].get(texture)
+        if textures is None:
             return None
+    else:
+        textures = slab_textures[blockid]
+    top = self.load_image_texture("assets/minecraft/textures/block/%s.png" % textures[0])
+    side = self.load_image_texture("assets/minecraft/textures/block/%s.png" % textures[1])
 
-    elif blockid == 181: # double red sandstone slab
-        if texture == 0: # red sandstone
-            top = self.load_image_texture("assets/minecraft/textures/block/red_sandstone_top.png")
-            side = self.load_image_texture("assets/minecraft/textures/block/red_sandstone.png")
-        elif texture == 8: # 'full' red sandstone (smooth)
-            top = side = self.load_image_texture("assets/minecraft/textures/block/red_sandstone_top.png");
-        else:
-            return None
-    elif blockid == 204 or blockid == 205: # purpur slab (single=205 double=204)
-        top = side = self.load_image_texture("assets/minecraft/textures/block/purpur_block.png");
-
-    elif blockid == 11340: # prismarine slabs
-        top = side = self.load_image_texture("assets/minecraft/textures/block/prismarine.png").copy()
-    elif blockid == 11341: # dark prismarine slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/dark_prismarine.png").copy()
-    elif blockid == 11342: #  prismarine brick slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/prismarine_bricks.png").copy()
-    elif blockid == 11343: #  andesite slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/andesite.png").copy()
-    elif blockid == 11344: #  diorite slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/diorite.png").copy()
-    elif blockid == 11345: #  granite slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/granite.png").copy()
-    elif blockid == 11346: #  polished andesite slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/polished_andesite.png").copy()
-    elif blockid == 11347: #  polished diorite slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/polished_diorite.png").copy()
-    elif blockid == 11348: #  polished granite slabs
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/polished_granite.png").copy()
-    elif blockid == 11349: #  red nether brick slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/red_nether_bricks.png").copy()
-    elif blockid == 11350: #  smooth sandstone slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/sandstone_top.png").copy()
-    elif blockid == 11351: #  cut sandstone slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/cut_sandstone.png").copy()
-    elif blockid == 11352: #  smooth red sandstone slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/red_sandstone_top.png").copy()
-    elif blockid == 11353: #  cut red sandstone slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/cut_red_sandstone.png").copy()
-    elif blockid == 11354: #  end_stone_brick_slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/end_stone_bricks.png").copy()
-    elif blockid == 11355: #  mossy_cobblestone_slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/mossy_cobblestone.png").copy()
-    elif blockid == 11356: #  mossy_stone_brick_slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/mossy_stone_bricks.png").copy()
-    elif blockid == 11357: #  smooth_quartz_slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/quartz_block_bottom.png").copy()
-    elif blockid == 11358: #  smooth_stone_slab
-        top  = self.load_image_texture("assets/minecraft/textures/block/smooth_stone.png").copy()
-        side = self.load_image_texture("assets/minecraft/textures/block/smooth_stone_slab_side.png").copy()
-    elif blockid == 1027: #  blackstone_slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/blackstone.png").copy()
-    elif blockid == 1028: #  polished_blackstone_slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/polished_blackstone.png").copy()
-    elif blockid == 1029: #  polished_blackstone_brick_slab
-        top = side  = self.load_image_texture("assets/minecraft/textures/block/polished_blackstone_bricks.png").copy()
-    elif blockid in range(1072, 1080):
-        copper_tex = {
-            1072: "assets/minecraft/textures/block/cut_copper.png",
-            1076: "assets/minecraft/textures/block/cut_copper.png",
-            1073: "assets/minecraft/textures/block/exposed_cut_copper.png",
-            1077: "assets/minecraft/textures/block/exposed_cut_copper.png",
-            1074: "assets/minecraft/textures/block/weathered_cut_copper.png",
-            1078: "assets/minecraft/textures/block/weathered_cut_copper.png",
-            1075: "assets/minecraft/textures/block/oxidized_cut_copper.png",
-            1079: "assets/minecraft/textures/block/oxidized_cut_copper.png",
-        }
-        top = side = self.load_image_texture(copper_tex[blockid]).copy()
-    elif blockid in range(1103, 1107):
-        deepslate_tex = {
-            1103: "assets/minecraft/textures/block/cobbled_deepslate.png",
-            1104: "assets/minecraft/textures/block/polished_deepslate.png",
-            1105: "assets/minecraft/textures/block/deepslate_bricks.png",
-            1106: "assets/minecraft/textures/block/deepslate_tiles.png",
-        }
-        top = side = self.load_image_texture(deepslate_tex[blockid]).copy()
-    elif blockid == 1124:
-        top = side = self.load_image_texture("assets/minecraft/textures/block/mud_bricks.png").copy()
-    elif blockid == 1789:
-        top = side = self.load_image_texture("assets/minecraft/textures/block/mangrove_planks.png").copy()
-
-    if blockid == 43 or blockid == 181 or blockid == 204: # double slab
+    if blockid in double_slabs:
         return self.build_block(top, side)
     
     return self.build_slab_block(top, side, data & 8 == 8)
@@ -2117,35 +2446,24 @@ solidmodelblock(blockid=46, name="tnt", nospawn=True)
 # moss stone
 solidmodelblock(blockid=48, name="mossy_cobblestone")
 
+# the rotated torch directions for every map rotation, by data
+torch_rotations = [[0, 1, 2, 3, 4, 5],
+                   [0, 3, 4, 2, 1, 5],
+                   [0, 2, 1, 4, 3, 5],
+                   [0, 4, 3, 1, 2, 5]]
+torch_textures = {50: "torch", 75: "redstone_torch_off", 76: "redstone_torch", 1039: "soul_torch"}
+# the build_full_block() argument a wall torch is drawn as, and which way
+# it leans, for torches pointing south, north, west and east
+wall_torch_faces = {1: (3, -1), 2: (2, 1), 3: (1, 1), 4: (4, -1)}
+
 # torch, redstone torch (off), redstone torch(on), soul_torch
 @material(blockid=[50, 75, 76, 1039], data=[1, 2, 3, 4, 5], transparent=True)
 def torches(self, blockid, data):
     # first, rotations
-    if self.rotation == 1:
-        if data == 1: data = 3
-        elif data == 2: data = 4
-        elif data == 3: data = 2
-        elif data == 4: data = 1
-    elif self.rotation == 2:
-        if data == 1: data = 2
-        elif data == 2: data = 1
-        elif data == 3: data = 4
-        elif data == 4: data = 3
-    elif self.rotation == 3:
-        if data == 1: data = 4
-        elif data == 2: data = 3
-        elif data == 3: data = 1
-        elif data == 4: data = 2
+    data = torch_rotations[self.rotation][data]
     
     # choose the proper texture
-    if blockid == 50: # torch
-        small = self.load_image_texture("assets/minecraft/textures/block/torch.png")
-    elif blockid == 75: # off redstone torch
-        small = self.load_image_texture("assets/minecraft/textures/block/redstone_torch_off.png")
-    elif blockid == 76: # on redstone torch
-        small = self.load_image_texture("assets/minecraft/textures/block/redstone_torch.png")
-    elif blockid == 1039: # soul torch
-        small= self.load_image_texture("assets/minecraft/textures/block/soul_torch.png")
+    small = self.load_image_texture("assets/minecraft/textures/block/%s.png" % torch_textures[blockid])
     # compose a torch bigger than the normal
     # (better for doing transformations)
     torch = Image.new("RGBA", (16,16), self.bgcolor)
@@ -2156,25 +2474,15 @@ def torches(self, blockid, data):
     # angle of inclination of the texture
     rotation = 15
     
-    if data == 1: # pointing south
-        torch = torch.rotate(-rotation, Image.NEAREST) # nearest filter is more nitid.
-        img = self.build_full_block(None, None, None, torch, None, None)
-        
-    elif data == 2: # pointing north
-        torch = torch.rotate(rotation, Image.NEAREST)
-        img = self.build_full_block(None, None, torch, None, None, None)
-        
-    elif data == 3: # pointing west
-        torch = torch.rotate(rotation, Image.NEAREST)
-        img = self.build_full_block(None, torch, None, None, None, None)
-        
-    elif data == 4: # pointing east
-        torch = torch.rotate(-rotation, Image.NEAREST)
-        img = self.build_full_block(None, None, None, None, torch, None)
+    if data in wall_torch_faces:
+        face, lean = wall_torch_faces[data]
+        faces = [None] * 6
+        faces[face] = torch.rotate(lean * rotation, Image.NEAREST) # nearest filter is more nitid.
+        img = self.build_full_block(*faces)
         
     elif data == 5: # standing on the floor
         # compose a "3d torch".
-        img = Image.new("RGBA", (24,24), self.bgcolor)
+        img = blank_block(self.bgcolor).copy()
         
         small_crop = small.crop((2,2,14,14))
         slice = small_crop.copy()
@@ -2220,14 +2528,9 @@ def lantern(self, blockid, data):
     # mimic parts of build_full_block, to get an object smaller than a block 
     # build_full_block(self, top, side1, side2, side3, side4, bottom=None):
     # a non transparent block uses top, side 3 and side 4.
-    img = Image.new("RGBA", (24, 24), self.bgcolor)
-    # prepare the side textures
-    # side3
-    side3 = self.transform_image_side(side_texture)
-    # Darken this side
-    sidealpha = side3.split()[3]
-    side3 = ImageEnhance.Brightness(side3).enhance(0.9)
-    side3.putalpha(sidealpha)
+    img = blank_block(self.bgcolor).copy()
+    # prepare the side textures, sheared and darkened like side3 and side4
+    side3, side4 = self.build_sides(side_texture)
     # place the transformed texture
     hangoff = 0
     if data == 1:
@@ -2236,12 +2539,6 @@ def lantern(self, blockid, data):
     yoff =- hangoff
     alpha_over(img, side3, (xoff+0, yoff+6), side3)
     # side4
-    side4 = self.transform_image_side(side_texture)
-    side4 = side4.transpose(Image.FLIP_LEFT_RIGHT)
-    # Darken this side
-    sidealpha = side4.split()[3]
-    side4 = ImageEnhance.Brightness(side4).enhance(0.8)
-    side4.putalpha(sidealpha)
     alpha_over(img, side4, (12-xoff, yoff+6), side4)
     # top
     top = self.transform_image_top(top_texture)
@@ -2282,31 +2579,23 @@ def bamboo(self, blockid, data):
     # mimic parts of build_full_block, to get an object smaller than a block 
     # build_full_block(self, top, side1, side2, side3, side4, bottom=None):
     # a non transparent block uses top, side 3 and side 4.
-    img = Image.new("RGBA", (24, 24), self.bgcolor)
-    # prepare the side textures
-    # side3
-    side3 = self.transform_image_side(side_texture)
-    # Darken this side
-    sidealpha = side3.split()[3]
-    side3 = ImageEnhance.Brightness(side3).enhance(0.9)
-    side3.putalpha(sidealpha)
+    img = blank_block(self.bgcolor).copy()
+    # prepare the side textures, sheared and darkened like side3 and side4
+    side3, side4 = self.build_sides(side_texture)
     # place the transformed texture
     xoff = 3
     yoff = 0
     alpha_over(img, side3, (4+xoff, yoff), side3)
     # side4
-    side4 = self.transform_image_side(side_texture)
-    side4 = side4.transpose(Image.FLIP_LEFT_RIGHT)
-    # Darken this side
-    sidealpha = side4.split()[3]
-    side4 = ImageEnhance.Brightness(side4).enhance(0.8)
-    side4.putalpha(sidealpha)
     alpha_over(img, side4, (-4+xoff, yoff), side4)
     # top
     top = self.transform_image_top(top_texture)
     alpha_over(img, top, (-4+xoff, -5), top)
     return img
 
+# where the compost goes, by how full the composter is
+composter_nudge = [None, (0, 9), (0, 8), (0, 7), (0, 6), (0, 4), (0, 2), (0, 0), (0, 0)]
+
 # composter
 @material(blockid=11417, data=list(range(9)), transparent=True)
 def composter(self, blockid, data):
@@ -2324,10 +2613,8 @@ def composter(self, blockid, data):
         compost = self.transform_image_top(
             self.load_image_texture("assets/minecraft/textures/block/composter_compost.png"))
 
-    nudge = {1: (0, 9), 2: (0, 8), 3: (0, 7), 4: (0, 6), 5: (0, 4), 6: (0, 2), 7: (0, 0), 8: (0, 0)}
-
     img = self.build_full_block(None, side, side, None, None)
-    alpha_over(img, compost, nudge[data], compost)
+    alpha_over(img, compost, composter_nudge[data], compost)
     img2 = self.build_full_block(top, None, None, side, side)
     alpha_over(img, img2, (0, 0), img2)
     return img
@@ -2353,6 +2640,70 @@ def fire(self, blockid, data):
 # monster spawner
 modelblock(blockid=52, name="spawner", solid=True, transparent=True)
 
+# the side textures of the stairs, by block id
+stair_textures = {
+    53: "assets/minecraft/textures/block/oak_planks.png",
+    67: "assets/minecraft/textures/block/cobblestone.png",
+    108: "assets/minecraft/textures/block/bricks.png",
+    109: "assets/minecraft/textures/block/stone_bricks.png",
+    114: "assets/minecraft/textures/block/nether_bricks.png",
+    128: "assets/minecraft/textures/block/sandstone.png",
+    134: "assets/minecraft/textures/block/spruce_planks.png",
+    135: "assets/minecraft/textures/block/birch_planks.png",
+    136: "assets/minecraft/textures/block/jungle_planks.png",
+    156: "assets/minecraft/textures/block/quartz_block_side.png",
+    163: "assets/minecraft/textures/block/acacia_planks.png",
+    164: "assets/minecraft/textures/block/dark_oak_planks.png",
+    180: "assets/minecraft/textures/block/red_sandstone.png",
+    203: "assets/minecraft/textures/block/purpur_block.png",
+    509: "assets/minecraft/textures/block/crimson_planks.png",
+    510: "assets/minecraft/textures/block/warped_planks.png",
+    11337: "assets/minecraft/textures/block/prismarine.png",
+    11338: "assets/minecraft/textures/block/dark_prismarine.png",
+    11339: "assets/minecraft/textures/block/prismarine_bricks.png",
+    11370: "assets/minecraft/textures/block/mossy_stone_bricks.png",
+    11371: "assets/minecraft/textures/block/mossy_cobblestone.png",
+    11374: "assets/minecraft/textures/block/sandstone_top.png",
+    11375: "assets/minecraft/textures/block/quartz_block_side.png",
+    11376: "assets/minecraft/textures/block/polished_granite.png",
+    11377: "assets/minecraft/textures/block/polished_diorite.png",
+    11378: "assets/minecraft/textures/block/polished_andesite.png",
+    11379: "assets/minecraft/textures/block/stone.png",
+    11380: "assets/minecraft/textures/block/granite.png",
+    11381: "assets/minecraft/textures/block/diorite.png",
+    11382: "assets/minecraft/textures/block/andesite.png",
+    11383: "assets/minecraft/textures/block/end_stone_bricks.png",
+    11384: "assets/minecraft/textures/block/red_nether_bricks.png",
+    11415: "assets/minecraft/textures/block/red_sandstone_top.png",
+    1030: "assets/minecraft/textures/block/blackstone.png",
+    1031: "assets/minecraft/textures/block/polished_blackstone.png",
+    1032: "assets/minecraft/textures/block/polished_blackstone_bricks.png",
+    # Cut copper stairs
+    1064: "assets/minecraft/textures/block/cut_copper.png",
+    1065: "assets/minecraft/textures/block/exposed_cut_copper.png",
+    1066: "assets/minecraft/textures/block/weathered_cut_copper.png",
+    1067: "assets/minecraft/textures/block/oxidized_cut_copper.png",
+    # Waxed cut copper stairs
+    1068: "assets/minecraft/textures/block/cut_copper.png",
+    1069: "assets/minecraft/textures/block/exposed_cut_copper.png",
+    1070: "assets/minecraft/textures/block/weathered_cut_copper.png",
+    1071: "assets/minecraft/textures/block/oxidized_cut_copper.png",
+    # Deepslate
+    1099: "assets/minecraft/textures/block/cobbled_deepslate.png",
+    1100: "assets/minecraft/textures/block/polished_deepslate.png",
+    1101: "assets/minecraft/textures/block/deepslate_bricks.png",
+    1102: "assets/minecraft/textures/block/deepslate_tiles.png",
+    1108: "assets/minecraft/textures/block/mangrove_planks.png",
+}
+
+# sandstone, red sandstone, and quartz stairs have special top texture
+stair_top_textures = {
+    128: "assets/minecraft/textures/block/sandstone_top.png",
+    156: "assets/minecraft/textures/block/quartz_block_top.png",
+    180: "assets/minecraft/textures/block/red_sandstone_top.png",
+    11375: "assets/minecraft/textures/block/quartz_block_top.png",
+}
+
 # wooden, cobblestone, red brick, stone brick, netherbrick, sandstone, spruce, birch,
 # jungle, quartz, red sandstone, purpur_stairs, crimson_stairs, warped_stairs, (dark) prismarine,
 # mossy brick and mossy cobblestone, stone smooth_quartz
@@ -2366,125 +2717,82 @@ modelblock(blockid=52, name="spawner", solid=True, transparent=True)
                    1067, 1068, 1069, 1070, 1071, 1099, 1100, 1101, 1102, 1108],
           data=list(range(128)), transparent=True, solid=True, nospawn=True)
 def stairs(self, blockid, data):
-    # preserve the upside-down bit
-    upside_down = data & 0x4
-
-    # find solid quarters within the top or bottom half of the block
+    side = stair_textures[blockid]
+    top = stair_top_textures.get(blockid, side)
+
+    # the two lowest bits only tell which way the stairs ascend, and that is
+    # already folded into the quarter bits, so draw each shape only once, and
+    # only once for all the stairs that look the same (like waxed copper)
+    key = ('stairs', side, top, data & 0b1111100)
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_stairs(self, side, top, data)
+    return self.material_cache[key].copy()
+
+@functools.lru_cache(maxsize=None)
+def stair_cuts(data):
+    """Returns the parts to clear out of the surfaces of a stair block, as a
+    list of (surface, box) pairs. Boxes include both corners. The cuts only
+    depend on the upside-down and quarter bits of data, so they are worked
+    out once and shared by every kind of stairs."""
+    # find solid quarters within the top or bottom half of the block.
+    # generate_pseudo_data() in iterate.c already accounts for northdirection
+    # when it sets these bits, so they need no further rotation here
     #                   NW           NE           SE           SW
-    quarters = [data & 0x8, data & 0x10, data & 0x20, data & 0x40]
-
-    # rotate the quarters so we can pretend northdirection is always upper-left
-    numpy.roll(quarters, [0,1,3,2][self.rotation])
-    nw,ne,se,sw = quarters
-
-    stair_id_to_tex = {
-        53: "assets/minecraft/textures/block/oak_planks.png",
-        67: "assets/minecraft/textures/block/cobblestone.png",
-        108: "assets/minecraft/textures/block/bricks.png",
-        109: "assets/minecraft/textures/block/stone_bricks.png",
-        114: "assets/minecraft/textures/block/nether_bricks.png",
-        128: "assets/minecraft/textures/block/sandstone.png",
-        134: "assets/minecraft/textures/block/spruce_planks.png",
-        135: "assets/minecraft/textures/block/birch_planks.png",
-        136: "assets/minecraft/textures/block/jungle_planks.png",
-        156: "assets/minecraft/textures/block/quartz_block_side.png",
-        163: "assets/minecraft/textures/block/acacia_planks.png",
-        164: "assets/minecraft/textures/block/dark_oak_planks.png",
-        180: "assets/minecraft/textures/block/red_sandstone.png",
-        203: "assets/minecraft/textures/block/purpur_block.png",
-        509: "assets/minecraft/textures/block/crimson_planks.png",
-        510: "assets/minecraft/textures/block/warped_planks.png",
-        11337: "assets/minecraft/textures/block/prismarine.png",
-        11338: "assets/minecraft/textures/block/dark_prismarine.png",
-        11339: "assets/minecraft/textures/block/prismarine_bricks.png",
-        11370: "assets/minecraft/textures/block/mossy_stone_bricks.png",
-        11371: "assets/minecraft/textures/block/mossy_cobblestone.png",
-        11374: "assets/minecraft/textures/block/sandstone_top.png",
-        11375: "assets/minecraft/textures/block/quartz_block_side.png",
-        11376: "assets/minecraft/textures/block/polished_granite.png",
-        11377: "assets/minecraft/textures/block/polished_diorite.png",
-        11378: "assets/minecraft/textures/block/polished_andesite.png",
-        11379: "assets/minecraft/textures/block/stone.png",
-        11380: "assets/minecraft/textures/block/granite.png",
-        11381: "assets/minecraft/textures/block/diorite.png",
-        11382: "assets/minecraft/textures/block/andesite.png",
-        11383: "assets/minecraft/textures/block/end_stone_bricks.png",
-        11384: "assets/minecraft/textures/block/red_nether_bricks.png",
-        11415: "assets/minecraft/textures/block/red_sandstone_top.png",
-        1030: "assets/minecraft/textures/block/blackstone.png",
-        1031: "assets/minecraft/textures/block/polished_blackstone.png",
-        1032: "assets/minecraft/textures/block/polished_blackstone_bricks.png",
-        # Cut copper stairs
-        1064: "assets/minecraft/textures/block/cut_copper.png",
-        1065: "assets/minecraft/textures/block/exposed_cut_copper.png",
-        1066: "assets/minecraft/textures/block/weathered_cut_copper.png",
-        1067: "assets/minecraft/textures/block/oxidized_cut_copper.png",
-        # Waxed cut copper stairs
-        1068: "assets/minecraft/textures/block/cut_copper.png",
-        1069: "assets/minecraft/textures/block/exposed_cut_copper.png",
-        1070: "assets/minecraft/textures/block/weathered_cut_copper.png",
-        1071: "assets/minecraft/textures/block/oxidized_cut_copper.png",
-        # Deepslate
-        1099: "assets/minecraft/textures/block/cobbled_deepslate.png",
-        1100: "assets/minecraft/textures/block/polished_deepslate.png",
-        1101: "assets/minecraft/textures/block/deepslate_bricks.png",
-        1102: "assets/minecraft/textures/block/deepslate_tiles.png",
-        1108: "assets/minecraft/textures/block/mangrove_planks.png",
-    }
-
-    texture = self.load_image_texture(stair_id_to_tex[blockid]).copy()
-
-    outside_l = texture.copy()
-    outside_r = texture.copy()
-    inside_l = texture.copy()
-    inside_r = texture.copy()
-
-    # sandstone, red sandstone, and quartz stairs have special top texture
-    special_tops = {
-        128: "assets/minecraft/textures/block/sandstone_top.png",
-        156: "assets/minecraft/textures/block/quartz_block_top.png",
-        180: "assets/minecraft/textures/block/red_sandstone_top.png",
-        11375: "assets/minecraft/textures/block/quartz_block_top.png",
-    }
-
-    if blockid in special_tops:
-        texture = self.load_image_texture(special_tops[blockid]).copy()
- 
-
-    slab_top = texture.copy()
+    nw, ne, se, sw = data & 0x8, data & 0x10, data & 0x20, data & 0x40
 
-    push = 8 if upside_down else 0
-
-    def rect(tex,coords):
-        ImageDraw.Draw(tex).rectangle(coords,outline=(0,0,0,0),fill=(0,0,0,0))
+    push = 8 if data & 0x4 else 0
 
     # cut out top or bottom half from inner surfaces
-    rect(inside_l, (0,8-push,15,15-push))
-    rect(inside_r, (0,8-push,15,15-push))
+    cuts = [('inside_l', (0,8-push,15,15-push)),
+            ('inside_r', (0,8-push,15,15-push))]
 
     # cut out missing or obstructed quarters from each surface
     if not nw:
-        rect(outside_l, (0,push,7,7+push))
-        rect(texture, (0,0,7,7))
+        cuts.append(('outside_l', (0,push,7,7+push)))
+        cuts.append(('texture', (0,0,7,7)))
     if not nw or sw:
-        rect(inside_r, (8,push,15,7+push)) # will be flipped
+        cuts.append(('inside_r', (8,push,15,7+push))) # will be flipped
     if not ne:
-        rect(texture, (8,0,15,7))
+        cuts.append(('texture', (8,0,15,7)))
     if not ne or nw:
-        rect(inside_l, (0,push,7,7+push))
+        cuts.append(('inside_l', (0,push,7,7+push)))
     if not ne or se:
-        rect(inside_r, (0,push,7,7+push)) # will be flipped
+        cuts.append(('inside_r', (0,push,7,7+push))) # will be flipped
     if not se:
-        rect(outside_r, (0,push,7,7+push)) # will be flipped
-        rect(texture, (8,8,15,15))
+        cuts.append(('outside_r', (0,push,7,7+push))) # will be flipped
+        cuts.append(('texture', (8,8,15,15)))
     if not se or sw:
-        rect(inside_l, (8,push,15,7+push))
+        cuts.append(('inside_l', (8,push,15,7+push)))
     if not sw:
-        rect(outside_l, (8,push,15,7+push))
-        rect(outside_r, (8,push,15,7+push)) # will be flipped
-        rect(texture, (0,8,7,15))
+        cuts.append(('outside_l', (8,push,15,7+push)))
+        cuts.append(('outside_r', (8,push,15,7+push))) # will be flipped
+        cuts.append(('texture', (0,8,7,15)))
 
-    img = Image.new("RGBA", (24,24), self.bgcolor)
+    return cuts
+
+def draw_stairs(self, side, top, data):
+    # preserve the upside-down bit
+    upside_down = data & 0x4
+
+    side = self.load_image_texture(side)
+
+    # these get parts cut out of them below, so each needs its own copy
+    outside_l = side.copy()
+    outside_r = side.copy()
+    inside_l = side.copy()
+    inside_r = side.copy()
+
+    slab_top = self.load_image_texture(top)
+
+    # slab_top is only ever read, texture has the missing quarters cut out
+    texture = slab_top.copy()
+
+    surfaces = {'texture': texture, 'outside_l': outside_l, 'outside_r': outside_r,
+                'inside_l': inside_l, 'inside_r': inside_r}
+    for surface, (x0, y0, x1, y1) in stair_cuts(data & 0b1111100):
+        surfaces[surface].paste((0,0,0,0), (x0, y0, x1 + 1, y1 + 1))
+
+    img = blank_block(self.bgcolor).copy()
 
     if upside_down:
         # top should have no cut-outs after all
@@ -2497,19 +2805,15 @@ def stairs(self, blockid, data):
     # render inner left surface
     inside_l = self.transform_image_side(inside_l)
     # Darken the vertical part of the second step
-    sidealpha = inside_l.split()[3]
     # darken it a bit more than usual, looks better
-    inside_l = ImageEnhance.Brightness(inside_l).enhance(0.8)
-    inside_l.putalpha(sidealpha)
+    inside_l = self.darken(inside_l, 0.8)
     alpha_over(img, inside_l, (6,3))
 
     # render inner right surface
     inside_r = self.transform_image_side(inside_r).transpose(Image.FLIP_LEFT_RIGHT)
     # Darken the vertical part of the second step
-    sidealpha = inside_r.split()[3]
     # darken it a bit more than usual, looks better
-    inside_r = ImageEnhance.Brightness(inside_r).enhance(0.7)
-    inside_r.putalpha(sidealpha)
+    inside_r = self.darken(inside_r, 0.7)
     alpha_over(img, inside_r, (6,3))
 
     # render outer surfaces
@@ -2517,6 +2821,98 @@ def stairs(self, blockid, data):
 
     return img
 
+def load_chest_texture(self, filename):
+    # the flipped and resized texture is kept around so that it is only
+    # redone once per texture file
+    key = ('chest texture', filename)
+    if key not in self.material_cache:
+        t = self.load_image(filename).transpose(Image.FLIP_TOP_BOTTOM) # for some reason the 1.15 images are upside down
+        if t.size != (64, 64): t = t.resize((64, 64), Image.ANTIALIAS)
+        self.material_cache[key] = t
+    return self.material_cache[key]
+
+def compose_chest_face(self, size, layers, left=0):
+    # builds one face of a chest out of (texture, box, position) layers,
+    # each of them cropped out of its texture and drawn over the last.
+    # For a face that is wider than size, left picks the part of it to draw
+    face = Image.new("RGBA", size, self.bgcolor)
+    for t, box, (x, y) in layers:
+        x -= left
+        if x >= size[0] or x + box[2] - box[0] <= 0:
+            continue # not in this part of the face
+        alpha_over(face, t.crop(box), (x, y))
+    return face
+
+def draw_chest_parts(self, blockid):
+    if blockid == 130: t = load_chest_texture(self, "assets/minecraft/textures/entity/chest/ender.png")
+    else:
+        try:
+            t = load_chest_texture(self, "assets/minecraft/textures/entity/chest/normal.png")
+        except (TextureException, IOError):
+            t = load_chest_texture(self, "assets/minecraft/textures/entity/chest/chest.png")
+
+    # the textures is no longer in terrain.png, get it from
+    # item/chest.png and get by cropping all the needed stuff
+    top = compose_chest_face(self, (16, 16), [(t, (28, 50, 42, 64), (1, 1))])
+    front = compose_chest_face(self, (16, 16), [
+        (t, (42, 45, 56, 50), (1, 1)),
+        (t, (42, 21, 56, 31), (1, 5)),
+        (t, (1, 59, 3, 63), (7, 3)), # lock
+    ])
+    # left side, right side, and back are essentially the same for
+    # the default texture, we take it anyway just in case other
+    # textures make use of it.
+    side_l = compose_chest_face(self, (16, 16), [
+        (t, (14, 45, 28, 50), (1, 1)),
+        (t, (14, 21, 28, 31), (1, 5)),
+    ])
+    side_r = compose_chest_face(self, (16, 16), [
+        (t, (28, 45, 42, 50), (1, 1)),
+        (t, (28, 21, 42, 31), (1, 5)),
+    ])
+    back = compose_chest_face(self, (16, 16), [
+        (t, (0, 45, 14, 50), (1, 1)),
+        (t, (0, 21, 14, 31), (1, 5)),
+    ])
+
+    return top, front, side_l, side_r, back
+
+def draw_large_chest_parts(self, left):
+    # large chest, only the half of the top, front and back that starts at
+    # x = left is drawn
+    # the textures is no longer in terrain.png, get it from 
+    # item/chest.png and get all the needed stuff
+    t_left = load_chest_texture(self, "assets/minecraft/textures/entity/chest/normal_left.png")
+    t_right = load_chest_texture(self, "assets/minecraft/textures/entity/chest/normal_right.png")
+
+    top = compose_chest_face(self, (16, 16), [
+        (t_right, (29, 50, 44, 64), (1, 1)),
+        (t_left, (29, 50, 44, 64), (16, 1)),
+    ], left)
+    front = compose_chest_face(self, (16, 16), [
+        (t_left, (43, 45, 58, 50), (1, 1)),
+        (t_right, (43, 45, 58, 50), (16, 1)),
+        (t_left, (43, 21, 58, 31), (1, 5)),
+        (t_right, (43, 21, 58, 31), (16, 5)),
+        (t_left, (1, 59, 3, 63), (15, 3)), # lock
+    ], left)
+    back = compose_chest_face(self, (16, 16), [
+        (t_right, (14, 45, 29, 50), (1, 1)),
+        (t_left, (14, 45, 29, 50), (16, 1)),
+        (t_right, (14, 21, 29, 31), (1, 5)),
+        (t_left, (14, 21, 29, 31), (16, 5)),
+    ], left)
+    side_l = compose_chest_face(self, (16, 16), [
+        (t_left, (29, 45, 43, 50), (1, 1)),
+        (t_left, (29, 21, 43, 31), (1, 5)),
+    ])
+    side_r = compose_chest_face(self, (16, 16), [
+        (t_right, (0, 45, 14, 50), (1, 1)),
+        (t_right, (0, 21, 14, 31), (1, 5)),
+    ])
+
+    return top, front, back, side_l, side_r
+
 # normal, locked (used in april's fool day), ender and trapped chest
 # NOTE:  locked chest used to be id95 (which is now stained glass)
 @material(blockid=[54, 130, 146], data=list(range(30)), transparent = True)
@@ -2548,164 +2944,29 @@ def chests(self, blockid, data):
         # ancilData = 2,3,4,5 are used for this blockids
     
     if data & 24 == 0:
-        if blockid == 130: t = self.load_image("assets/minecraft/textures/entity/chest/ender.png")
-        else:
-            try:
-                t = self.load_image("assets/minecraft/textures/entity/chest/normal.png")
-            except (TextureException, IOError):
-                t = self.load_image("assets/minecraft/textures/entity/chest/chest.png")
-
-        t = ImageOps.flip(t) # for some reason the 1.15 images are upside down
-
-        # the textures is no longer in terrain.png, get it from
-        # item/chest.png and get by cropping all the needed stuff
-        if t.size != (64, 64): t = t.resize((64, 64), Image.ANTIALIAS)
-        # top
-        top = t.crop((28, 50, 42, 64))
-        top.load() # every crop need a load, crop is a lazy operation
-                   # see PIL manual
-        img = Image.new("RGBA", (16, 16), self.bgcolor)
-        alpha_over(img, top, (1, 1))
-        top = img
-        # front
-        front_top = t.crop((42, 45, 56, 50))
-        front_top.load()
-        front_bottom = t.crop((42, 21, 56, 31))
-        front_bottom.load()
-        front_lock = t.crop((1, 59, 3, 63))
-        front_lock.load()
-        front = Image.new("RGBA", (16, 16), self.bgcolor)
-        alpha_over(front, front_top, (1, 1))
-        alpha_over(front, front_bottom, (1, 5))
-        alpha_over(front, front_lock, (7, 3))
-        # left side
-        # left side, right side, and back are essentially the same for
-        # the default texture, we take it anyway just in case other
-        # textures make use of it.
-        side_l_top = t.crop((14, 45, 28, 50))
-        side_l_top.load()
-        side_l_bottom = t.crop((14, 21, 28, 31))
-        side_l_bottom.load()
-        side_l = Image.new("RGBA", (16, 16), self.bgcolor)
-        alpha_over(side_l, side_l_top, (1, 1))
-        alpha_over(side_l, side_l_bottom, (1, 5))
-        # right side
-        side_r_top = t.crop((28, 45, 42, 50))
-        side_r_top.load()
-        side_r_bottom = t.crop((28, 21, 42, 31))
-        side_r_bottom.load()
-        side_r = Image.new("RGBA", (16, 16), self.bgcolor)
-        alpha_over(side_r, side_r_top, (1, 1))
-        alpha_over(side_r, side_r_bottom, (1, 5))
-        # back
-        back_top = t.crop((0, 45, 14, 50))
-        back_top.load()
-        back_bottom = t.crop((0, 21, 14, 31))
-        back_bottom.load()
-        back = Image.new("RGBA", (16, 16), self.bgcolor)
-        alpha_over(back, back_top, (1, 1))
-        alpha_over(back, back_bottom, (1, 5))
+        # the faces only depend on the texture, so they are cut out once
+        key = ('chest parts', blockid == 130)
+        if key not in self.material_cache:
+            self.material_cache[key] = draw_chest_parts(self, blockid)
+        top, front, side_l, side_r, back = self.material_cache[key]
 
     else:
-        # large chest
-        # the textures is no longer in terrain.png, get it from 
-        # item/chest.png and get all the needed stuff
-        t_left = self.load_image("assets/minecraft/textures/entity/chest/normal_left.png")
-        t_right = self.load_image("assets/minecraft/textures/entity/chest/normal_right.png")
-        # for some reason the 1.15 images are upside down
-        t_left = ImageOps.flip(t_left)
-        t_right = ImageOps.flip(t_right)
-
-        # Top
-        top_left = t_right.crop((29, 50, 44, 64))
-        top_left.load()
-        top_right = t_left.crop((29, 50, 44, 64))
-        top_right.load()
-
-        top = Image.new("RGBA", (32, 16), self.bgcolor)
-        alpha_over(top,top_left, (1, 1))
-        alpha_over(top,top_right, (16, 1))
-
-        # Front
-        front_top_left = t_left.crop((43, 45, 58, 50))
-        front_top_left.load()
-        front_top_right = t_right.crop((43, 45, 58, 50))
-        front_top_right.load()
-
-        front_bottom_left = t_left.crop((43, 21, 58, 31))
-        front_bottom_left.load()
-        front_bottom_right = t_right.crop((43, 21, 58, 31))
-        front_bottom_right.load()
-
-        front_lock = t_left.crop((1, 59, 3, 63))
-        front_lock.load()
-
-        front = Image.new("RGBA", (32, 16), self.bgcolor)
-        alpha_over(front, front_top_left, (1, 1))
-        alpha_over(front, front_top_right, (16, 1))
-        alpha_over(front, front_bottom_left, (1, 5))
-        alpha_over(front, front_bottom_right, (16, 5))
-        alpha_over(front, front_lock, (15, 3))
-
-        # Back
-        back_top_left = t_right.crop((14, 45, 29, 50))
-        back_top_left.load()
-        back_top_right = t_left.crop((14, 45, 29, 50))
-        back_top_right.load()
-
-        back_bottom_left = t_right.crop((14, 21, 29, 31))
-        back_bottom_left.load()
-        back_bottom_right = t_left.crop((14, 21, 29, 31))
-        back_bottom_right.load()
-
-        back = Image.new("RGBA", (32, 16), self.bgcolor)
-        alpha_over(back, back_top_left, (1, 1))
-        alpha_over(back, back_top_right, (16, 1))
-        alpha_over(back, back_bottom_left, (1, 5))
-        alpha_over(back, back_bottom_right, (16, 5))
-        
-        # left side
-        side_l_top = t_left.crop((29, 45, 43, 50))
-        side_l_top.load()
-        side_l_bottom = t_left.crop((29, 21, 43, 31))
-        side_l_bottom.load()
-        side_l = Image.new("RGBA", (16, 16), self.bgcolor)
-        alpha_over(side_l, side_l_top, (1, 1))
-        alpha_over(side_l, side_l_bottom, (1, 5))
-        # right side
-        side_r_top = t_right.crop((0, 45, 14, 50))
-        side_r_top.load()
-        side_r_bottom = t_right.crop((0, 21, 14, 31))
-        side_r_bottom.load()
-        side_r = Image.new("RGBA", (16, 16), self.bgcolor)
-        alpha_over(side_r, side_r_top, (1, 1))
-        alpha_over(side_r, side_r_bottom, (1, 5))
-
         # double chest, left half
         if ((data & 24 == 8 and data & 7 in [3, 5]) or (data & 24 == 16 and data & 7 in [2, 4])):
-            top = top.crop((0, 0, 16, 16))
-            top.load()
-            front = front.crop((0, 0, 16, 16))
-            front.load()
-            back = back.crop((0, 0, 16, 16))
-            back.load()
-            #~ side = side_l
-
+            left = 0
         # double chest, right half
         elif ((data & 24 == 16 and data & 7 in [3, 5]) or (data & 24 == 8 and data & 7 in [2, 4])):
-            top = top.crop((16, 0, 32, 16))
-            top.load()
-            front = front.crop((16, 0, 32, 16))
-            front.load()
-            back = back.crop((16, 0, 32, 16))
-            back.load()
-            #~ side = side_r
-
+            left = 16
         else: # just in case
             return None
 
+        key = ('large chest parts', left)
+        if key not in self.material_cache:
+            self.material_cache[key] = draw_large_chest_parts(self, left)
+        top, front, back, side_l, side_r = self.material_cache[key]
+
     # compose the final block
-    img = Image.new("RGBA", (24, 24), self.bgcolor)
+    img = blank_block(self.bgcolor).copy()
     if data & 7 == 2: # north
         side = self.transform_image_side(side_r)
         alpha_over(img, side, (1, 7))
@@ -2744,47 +3005,31 @@ def chests(self, blockid, data):
 
     return img
 
+def draw_redstone_textures(self, color):
+    redstone_wire_t = self.load_image_texture("assets/minecraft/textures/block/redstone_dust_line0.png").rotate(90)
+    redstone_wire_t = self.tint_texture(redstone_wire_t,color)
+
+    redstone_cross_t = self.load_image_texture("assets/minecraft/textures/block/redstone_dust_dot.png")
+    redstone_cross_t = self.tint_texture(redstone_cross_t,color)
+
+    return redstone_wire_t, redstone_cross_t
+
 # redstone wire
 # uses pseudo-ancildata found in iterate.c
 @material(blockid=55, data=list(range(128)), transparent=True)
 def wire(self, blockid, data):
 
     if data & 0b1000000 == 64: # powered redstone wire
-        redstone_wire_t = self.load_image_texture("assets/minecraft/textures/block/redstone_dust_line0.png").rotate(90)
-        redstone_wire_t = self.tint_texture(redstone_wire_t,(255,0,0))
+        color = (255,0,0)
+    else: # unpowered redstone wire
+        color = (48,0,0)
 
-        redstone_cross_t = self.load_image_texture("assets/minecraft/textures/block/redstone_dust_dot.png")
-        redstone_cross_t = self.tint_texture(redstone_cross_t,(255,0,0))
+    # the tinted textures are the same for every wire with the same power
+    key = ('redstone', color)
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_redstone_textures(self, color)
+    redstone_wire_t, redstone_cross_t = self.material_cache[key]
 
-        
-    else: # unpowered redstone wire
-        redstone_wire_t = self.load_image_texture("assets/minecraft/textures/block/redstone_dust_line0.png").rotate(90)
-        redstone_wire_t = self.tint_texture(redstone_wire_t,(48,0,0))
-        
-        redstone_cross_t = self.load_image_texture("assets/minecraft/textures/block/redstone_dust_dot.png")
-        redstone_cross_t = self.tint_texture(redstone_cross_t,(48,0,0))
-
-    # generate an image per redstone direction
-    branch_top_left = redstone_cross_t.copy()
-    ImageDraw.Draw(branch_top_left).rectangle((0,0,4,15),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_top_left).rectangle((11,0,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_top_left).rectangle((0,11,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
-    
-    branch_top_right = redstone_cross_t.copy()
-    ImageDraw.Draw(branch_top_right).rectangle((0,0,15,4),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_top_right).rectangle((0,0,4,15),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_top_right).rectangle((0,11,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
-    
-    branch_bottom_right = redstone_cross_t.copy()
-    ImageDraw.Draw(branch_bottom_right).rectangle((0,0,15,4),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_bottom_right).rectangle((0,0,4,15),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_bottom_right).rectangle((11,0,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
-
-    branch_bottom_left = redstone_cross_t.copy()
-    ImageDraw.Draw(branch_bottom_left).rectangle((0,0,15,4),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_bottom_left).rectangle((11,0,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
-    ImageDraw.Draw(branch_bottom_left).rectangle((0,11,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
-            
     # generate the bottom texture
     if data & 0b111111 == 0:
         bottom = redstone_cross_t.copy()
@@ -2829,6 +3074,51 @@ solidmodelblock(blockid=56, name="diamond_ore")
 solidmodelblock(blockid=57, name="diamond_block")
 
 
+def lectern_affine(north_east):
+    # Builds the affine transformation that lays the stand top down
+    #   onto the slanted stand, as a flat list for Image.transform
+    def translate(x, y):
+        return numpy.array([[1, 0, x], [0, 1, y], [0, 0, 1]])
+    def rotate(angle):
+        tc = math.cos(math.radians(angle))
+        ts = math.sin(math.radians(angle))
+        return numpy.array([[tc, ts, 0], [-ts, tc, 0], [0, 0, 1]])
+    def scale(x, y):
+        return numpy.array([[1 / x, 0, 0], [0, 1 / y, 0], [0, 0, 1]])
+
+    if not north_east:  # South, West
+        # Translate: 8 -X, 8 -Y
+        transform_matrix = translate(8, 8)
+        # Rotate 40 degrees clockwise
+        transform_matrix = transform_matrix @ rotate(40)
+        # Shear in the Y direction
+        tt = math.tan(math.radians(10))
+        transform_matrix = transform_matrix @ numpy.array([[1, 0, 0], [tt, 1, 0], [0, 0, 1]])
+        # Scale to 70% height & 110% width
+        transform_matrix = transform_matrix @ scale(1.1, 0.7)
+        # Translate: 12 +X, 8 +Y
+        transform_matrix = transform_matrix @ translate(-12, -8)
+    else:  # North, East
+        # Translate: 8 -X, 8 -Y
+        transform_matrix = translate(8, 8)
+        # Shear in the X direction
+        tt = math.tan(math.radians(25))
+        transform_matrix = transform_matrix @ numpy.array([[1, tt, 0], [0, 1, 0], [0, 0, 1]])
+        # Scale to 80% height
+        transform_matrix = transform_matrix @ scale(1, 0.8)
+        # Rotate 220 degrees clockwise
+        transform_matrix = transform_matrix @ rotate(40 + 180)
+        # Scale to 60% height
+        transform_matrix = transform_matrix @ scale(1, 0.6)
+        # Translate: +13 X, +7 Y
+        transform_matrix = transform_matrix @ translate(-13, -7)
+
+    return transform_matrix[:2, :].ravel().tolist()
+
+# the stand top transformation for each facing, South, West, North, East
+lectern_affines = (lectern_affine(False), lectern_affine(False),
+                   lectern_affine(True), lectern_affine(True))
+
 @material(blockid=11366, data=list(range(8)), transparent=True, solid=True, nospawn=True)
 def lectern(self, blockid, data):
     # Do rotation, mask to not clobber book data
@@ -2850,13 +3140,6 @@ def lectern(self, blockid, data):
         img_out.paste(img_in, coord_paste)
         return img_out
 
-    def darken_image(img_src, darken_value):
-        # Takes an image & alters the brightness, leaving alpha intact
-        alpha = img_src.split()[3]
-        img_out = ImageEnhance.Brightness(img_src).enhance(darken_value)
-        img_out.putalpha(alpha)
-        return img_out
-
     # Generate base
     base_top_t = base_raw_t.rotate([0, 270, 180, 90][data & 0b11])
     # Front & side textures are one pixel taller than they should be
@@ -2885,9 +3168,9 @@ def lectern(self, blockid, data):
                                  pillar_side[1]['paste'], pillar_side[1]['rot'])
     pillar_side4_t = pillar_side4_t.transpose(Image.FLIP_LEFT_RIGHT)
     pillar_side3_t = self.transform_image_side(pillar_side3_t)
-    pillar_side3_t = darken_image(pillar_side3_t, 0.9)
+    pillar_side3_t = self.darken(pillar_side3_t, 0.9)
     pillar_side4_t = self.transform_image_side(pillar_side4_t).transpose(Image.FLIP_LEFT_RIGHT)
-    pillar_side4_t = darken_image(pillar_side4_t, 0.8)
+    pillar_side4_t = self.darken(pillar_side4_t, 0.8)
     alpha_over(img, pillar_side3_t, (3, 4), pillar_side3_t)
     alpha_over(img, pillar_side4_t, (9, 4), pillar_side4_t)
 
@@ -2900,9 +3183,9 @@ def lectern(self, blockid, data):
         stand_side4_t = create_tile(side_raw_t, (0, 4, 13, 8), (0, 0), 22.5)
 
     stand_side3_t = self.transform_image_angle(stand_side3_t, math.radians(22.5))
-    stand_side3_t = darken_image(stand_side3_t, 0.9)
+    stand_side3_t = self.darken(stand_side3_t, 0.9)
     stand_side4_t = self.transform_image_side(stand_side4_t).transpose(Image.FLIP_LEFT_RIGHT)
-    stand_side4_t = darken_image(stand_side4_t, 0.8)
+    stand_side4_t = self.darken(stand_side4_t, 0.8)
     stand_top_t = create_tile(top_raw_t, (0, 1, 16, 14), (0, 1), 0)
     if data & 0b100:
         # Lectern has a book, modify the stand top texture
@@ -2918,39 +3201,7 @@ def lectern(self, blockid, data):
         alpha_over(stand_top_t, book_part_t, (8, 4), book_part_t)
 
     # Perform affine transformation
-    transform_matrix = numpy.matrix(numpy.identity(3))
-    if (data & 0b11) in [0, 1]:  # South, West
-        # Translate: 8 -X, 8 -Y
-        transform_matrix *= numpy.matrix([[1, 0, 8], [0, 1, 8], [0, 0, 1]])
-        # Rotate 40 degrees clockwise
-        tc = math.cos(math.radians(40))
-        ts = math.sin(math.radians(40))
-        transform_matrix *= numpy.matrix([[tc, ts, 0], [-ts, tc, 0], [0, 0, 1]])
-        # Shear in the Y direction
-        tt = math.tan(math.radians(10))
-        transform_matrix *= numpy.matrix([[1, 0, 0], [tt, 1, 0], [0, 0, 1]])
-        # Scale to 70% height & 110% width
-        transform_matrix *= numpy.matrix([[1 / 1.1, 0, 0], [0, 1 / 0.7, 0], [0, 0, 1]])
-        # Translate: 12 +X, 8 +Y
-        transform_matrix *= numpy.matrix([[1, 0, -12], [0, 1, -8], [0, 0, 1]])
-    else:  # North, East
-        # Translate: 8 -X, 8 -Y
-        transform_matrix *= numpy.matrix([[1, 0, 8], [0, 1, 8], [0, 0, 1]])
-        # Shear in the X direction
-        tt = math.tan(math.radians(25))
-        transform_matrix *= numpy.matrix([[1, tt, 0], [0, 1, 0], [0, 0, 1]])
-        # Scale to 80% height
-        transform_matrix *= numpy.matrix([[1, 0, 0], [0, 1 / 0.8, 0], [0, 0, 1]])
-        # Rotate 220 degrees clockwise
-        tc = math.cos(math.radians(40 + 180))
-        ts = math.sin(math.radians(40 + 180))
-        transform_matrix *= numpy.matrix([[tc, ts, 0], [-ts, tc, 0], [0, 0, 1]])
-        # Scale to 60% height
-        transform_matrix *= numpy.matrix([[1, 0, 0], [0, 1 / 0.6, 0], [0, 0, 1]])
-        # Translate: +13 X, +7 Y
-        transform_matrix *= numpy.matrix([[1, 0, -13], [0, 1, -7], [0, 0, 1]])
-
-    transform_matrix = numpy.array(transform_matrix)[:2, :].ravel().tolist()
+    transform_matrix = lectern_affines[data & 0b11]
     stand_top_t = stand_top_t.transform((24, 24), Image.AFFINE, transform_matrix)
 
     img_stand = Image.new("RGBA", (24, 24), self.bgcolor)
@@ -2970,7 +3221,7 @@ def lectern(self, blockid, data):
 def loom(self, blockid, data):
     # normalize data so it can be used by a generic method
     blockstate = {}
-    blockstate['facing'] = {0:'south', 1:'west', 2:'north', 3:'east'}[data]
+    blockstate['facing'] = ('south', 'west', 'north', 'east')[data]
     return self.build_block_from_model('loom', blockstate)
 
 @material(blockid=11368, data=list(range(4)), transparent=True, solid=True, nospawn=True)
@@ -2978,11 +3229,11 @@ def stonecutter(self, blockid, data):
     # Do rotation
     data = (self.rotation + data) % 4
 
-    top_t = self.load_image_texture("assets/minecraft/textures/block/stonecutter_top.png").copy()
+    top_t = self.load_image_texture("assets/minecraft/textures/block/stonecutter_top.png")
     side_t = self.load_image_texture("assets/minecraft/textures/block/stonecutter_side.png")
     # Stonecutter saw texture contains multiple tiles, since it's
     #   16px wide rely on load_image_texture() to crop appropriately
-    blade_t = self.load_image_texture("assets/minecraft/textures/block/stonecutter_saw.png").copy()
+    blade_t = self.load_image_texture("assets/minecraft/textures/block/stonecutter_saw.png")
 
     top_t = top_t.rotate([180, 90, 0, 270][data])
     img = self.build_full_block((top_t, 7), None, None, side_t, side_t, None)
@@ -3003,11 +3254,31 @@ def grindstone(self, blockid, data):
     # Do rotation, mask to not clobber mounting info
     data = data & 0b1100 | ((self.rotation + (data & 0b11)) % 4)
 
+    # The layers only depend on the mounting, and for wall mounted
+    #   grindstones on which side the leg goes, so each of those is
+    #   composed once and then flipped & offset for the rotation
+    key = ('grindstone', data & 0b1100 | (data & 0b10 if data & 0b0100 else 0))
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_grindstone(self, data)
+    img = self.material_cache[key]
+
+    if data & 0b0100:  # wall mounted
+        offset_final = [(2, 1), (-2, 1), (-2, -1), (2, -1)][data & 0b11]
+    else:
+        offset_final = (0, 2 * (data >> 2) - 1)
+    if (data & 0b11) in [1, 3]:
+        img = img.transpose(Image.FLIP_LEFT_RIGHT)
+    img_final = Image.new("RGBA", (24, 24), self.bgcolor)
+    alpha_over(img_final, img, offset_final, img)
+
+    return img_final
+
+def draw_grindstone(self, data):
     # Load textures
-    side_raw_t = self.load_image_texture("assets/minecraft/textures/block/grindstone_side.png").copy()
-    round_raw_t = self.load_image_texture("assets/minecraft/textures/block/grindstone_round.png").copy()
-    pivot_raw_t = self.load_image_texture("assets/minecraft/textures/block/grindstone_pivot.png").copy()
-    leg_raw_t = self.load_image_texture("assets/minecraft/textures/block/dark_oak_log.png").copy()
+    side_raw_t = self.load_image_texture("assets/minecraft/textures/block/grindstone_side.png")
+    round_raw_t = self.load_image_texture("assets/minecraft/textures/block/grindstone_round.png")
+    pivot_raw_t = self.load_image_texture("assets/minecraft/textures/block/grindstone_pivot.png")
+    leg_raw_t = self.load_image_texture("assets/minecraft/textures/block/dark_oak_log.png")
 
     def create_tile(img_src, coord_crop, coord_paste,  scale):
         # Takes an image, crops a region, optionally scales the
@@ -3026,11 +3297,9 @@ def grindstone(self, blockid, data):
     if wall_mounted:
         pos_leg = (32, 28) if data & 0b11 in [2, 3] else (10, 18)
         coord_leg = [(0, 0), (-10, -1), (2, 3)]
-        offset_final = [(2, 1), (-2, 1), (-2, -1), (2, -1)][data & 0b11]
     else:
         pos_leg = [(22, 31), (22, 9)][data >> 3]
         coord_leg = [(0, 0), (-1, 2), (-2, -3)]
-        offset_final = (0, 2 * (data >> 2) - 1)
 
     # Create parts
     # Scale up small parts like pivot & leg to avoid ugly results
@@ -3082,18 +3351,14 @@ def grindstone(self, blockid, data):
 
     # Combine leg, side, round & pivot
     img = Image.new("RGBA", (24, 24), self.bgcolor)
-    img_final = img.copy()
     alpha_over(img, img_pivot, (1, -5), img_pivot)
     alpha_over(img, round_ud_t, (0, 2), round_ud_t)  # Fix gaps between face edges
     alpha_over(img, side_t, (3, 6), side_t)
     alpha_over(img, round_ud_t, (0, 1), round_ud_t)
     alpha_over(img, round_lr_t, (10, 6), round_lr_t)
     alpha_over(img, img_pivot, (-5, -1), img_pivot)
-    if (data & 0b11) in [1, 3]:
-        img = img.transpose(Image.FLIP_LEFT_RIGHT)
-    alpha_over(img_final, img, offset_final, img)
 
-    return img_final
+    return img
 
 
 # crops with 8 data values (like wheat)
@@ -3121,6 +3386,10 @@ def farmland(self, blockid, data):
     return self.build_full_block((top, 1), side, side, side, side)
 
 
+# how far a signpost is turned in the image, in radians, by data
+#                                W                N      ~90       E                   S        ~270
+signpost_angles = [math.radians(a) for a in (330.,345.,0.,15.,30.,55.,95.,120.,150.,165.,180.,195.,210.,230.,265.,310.)]
+
 # signposts
 @material(blockid=[63,11401,11402,11403,11404,11405,11406,12505,12506], data=list(range(16)), transparent=True)
 def signpost(self, blockid, data):
@@ -3150,27 +3419,30 @@ def signpost(self, blockid, data):
     texture = self.load_image_texture(texture_path).copy()
     
     # cut the planks to the size of a signpost
-    ImageDraw.Draw(texture).rectangle((0,12,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
+    texture.paste((0,0,0,0),(0,12,16,16))
 
     # If the signpost is looking directly to the image, draw some 
-    # random dots, they will look as text.
+    # random dots, they will look as text. The dots are seeded by the
+    # block, so a sign looks the same every run whichever thread draws it.
     if data in (0,1,2,3,4,5,15):
-        for i in range(15):
-            x = randint(4,11)
-            y = randint(3,7)
-            texture.putpixel((x,y),(0,0,0,255))
-
-    # Minecraft uses wood texture for the signpost stick
-    texture_stick = self.load_image_texture(texture_stick_path)
-    texture_stick = texture_stick.resize((12,12), Image.ANTIALIAS)
-    ImageDraw.Draw(texture_stick).rectangle((2,0,12,12),outline=(0,0,0,0),fill=(0,0,0,0))
+        rng = numpy.random.default_rng((blockid, data))
+        pixels = numpy.array(texture)
+        pixels[rng.integers(3, 8, size=15), rng.integers(4, 12, size=15)] = (0,0,0,255)
+        texture = Image.fromarray(pixels)
+
+    # Minecraft uses wood texture for the signpost stick. It looks the same
+    # whichever way the sign faces, so it's only scaled down once.
+    key = ('signpost stick', texture_stick_path)
+    if key not in self.material_cache:
+        texture_stick = self.load_image_texture(texture_stick_path)
+        texture_stick = texture_stick.resize((12,12), Image.ANTIALIAS)
+        texture_stick.paste((0,0,0,0),(2,0,12,12))
+        self.material_cache[key] = texture_stick
+    texture_stick = self.material_cache[key]
 
     img = Image.new("RGBA", (24,24), self.bgcolor)
 
-    #         W                N      ~90       E                   S        ~270
-    angles = (330.,345.,0.,15.,30.,55.,95.,120.,150.,165.,180.,195.,210.,230.,265.,310.)
-    angle = math.radians(angles[data])
-    post = self.transform_image_angle(texture, angle)
+    post = self.transform_image_angle(texture, signpost_angles[data])
 
     # choose the position of the "3D effect"
     incrementx = 0
@@ -3182,76 +3454,28 @@ def signpost(self, blockid, data):
     alpha_over(img, texture_stick,(11, 8),texture_stick)
     # post2 is a brighter signpost pasted with a small shift,
     # gives to the signpost some 3D effect.
-    post2 = ImageEnhance.Brightness(post).enhance(1.2)
+    post2 = post.point(brightness_table(1.2))
     alpha_over(img, post2,(incrementx, -3),post2)
     alpha_over(img, post, (0,-2), post)
 
     return img
 
 
+# what the doors are made of, by block id
+door_materials = {64: "oak", 71: "iron", 193: "spruce", 194: "birch", 195: "jungle", 196: "acacia",
+              197: "dark_oak", 457: "mangrove", 499: "crimson", 500: "warped"}
+
 # wooden and iron door
 # uses pseudo-ancildata found in iterate.c
 @material(blockid=[64,71,193,194,195,196,197,457, 499, 500], data=list(range(32)), transparent=True)
 def door(self, blockid, data):
     #Masked to not clobber block top/bottom & swung info
-    if self.rotation == 1:
-        if (data & 0b00011) == 0: data = data & 0b11100 | 1
-        elif (data & 0b00011) == 1: data = data & 0b11100 | 2
-        elif (data & 0b00011) == 2: data = data & 0b11100 | 3
-        elif (data & 0b00011) == 3: data = data & 0b11100 | 0
-    elif self.rotation == 2:
-        if (data & 0b00011) == 0: data = data & 0b11100 | 2
-        elif (data & 0b00011) == 1: data = data & 0b11100 | 3
-        elif (data & 0b00011) == 2: data = data & 0b11100 | 0
-        elif (data & 0b00011) == 3: data = data & 0b11100 | 1
-    elif self.rotation == 3:
-        if (data & 0b00011) == 0: data = data & 0b11100 | 3
-        elif (data & 0b00011) == 1: data = data & 0b11100 | 0
-        elif (data & 0b00011) == 2: data = data & 0b11100 | 1
-        elif (data & 0b00011) == 3: data = data & 0b11100 | 2
+    data = data & 0b11100 | ((self.rotation + (data & 0b11)) % 4)
 
     if data & 0x8 == 0x8: # top of the door
-        if blockid == 64: # classic wood door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/oak_door_top.png")
-        elif blockid == 71: # iron door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/iron_door_top.png")
-        elif blockid == 193: # spruce door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/spruce_door_top.png")
-        elif blockid == 194: # birch door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/birch_door_top.png")
-        elif blockid == 195: # jungle door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/jungle_door_top.png")
-        elif blockid == 196: # acacia door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/acacia_door_top.png")
-        elif blockid == 197: # dark_oak door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/dark_oak_door_top.png")
-        elif blockid == 457: # mangrove door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/mangrove_door_top.png")
-        elif blockid == 499: # crimson door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/crimson_door_top.png")
-        elif blockid == 500: # warped door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/warped_door_top.png")
+        raw_door = self.load_image_texture("assets/minecraft/textures/block/%s_door_top.png" % door_materials[blockid])
     else: # bottom of the door
-        if blockid == 64:
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/oak_door_bottom.png")
-        elif blockid == 71: # iron door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/iron_door_bottom.png")
-        elif blockid == 193: # spruce door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/spruce_door_bottom.png")
-        elif blockid == 194: # birch door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/birch_door_bottom.png")
-        elif blockid == 195: # jungle door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/jungle_door_bottom.png")
-        elif blockid == 196: # acacia door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/acacia_door_bottom.png")
-        elif blockid == 197: # dark_oak door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/dark_oak_door_bottom.png")
-        elif blockid == 457: # mangrove door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/mangrove_door_bottom.png")
-        elif blockid == 499: # crimson door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/crimson_door_bottom.png")
-        elif blockid == 500: # warped door
-            raw_door = self.load_image_texture("assets/minecraft/textures/block/warped_door_bottom.png")
+        raw_door = self.load_image_texture("assets/minecraft/textures/block/%s_door_bottom.png" % door_materials[blockid])
 
     # if you want to render all doors as closed, then force
     # force closed to be True
@@ -3430,7 +3654,7 @@ def wall_sign(self, blockid, data): # wall sign
     texture_path = "assets/minecraft/textures/block/" + sign_texture[blockid]
     texture = self.load_image_texture(texture_path).copy()
     # cut the planks to the size of a signpost
-    ImageDraw.Draw(texture).rectangle((0,12,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
+    texture.paste((0,0,0,0),(0,12,16,16))
 
     # draw some random black dots, they will look as text
     """ don't draw text at the moment, they are used in blank for decoration
@@ -3458,7 +3682,7 @@ def wall_sign(self, blockid, data): # wall sign
         incrementx = -1
         sign = self.build_full_block(None, None, None, texture, None)
 
-    sign2 = ImageEnhance.Brightness(sign).enhance(1.2)
+    sign2 = sign.point(brightness_table(1.2))
     alpha_over(img, sign2,(incrementx, 2),sign2)
     alpha_over(img, sign, (0,3), sign)
 
@@ -3509,7 +3733,7 @@ def levers(self, blockid, data):
     stick = self.load_image_texture("assets/minecraft/textures/block/lever.png").copy()
     c_stick = Image.new("RGBA", (16,16), self.bgcolor)
     
-    tmp = ImageEnhance.Brightness(stick).enhance(0.8)
+    tmp = self.darken(stick, 0.8)
     alpha_over(c_stick, tmp, (1,0), tmp)
     alpha_over(c_stick, stick, (0,0), stick)
     t_stick = self.transform_image_side(c_stick.rotate(45, Image.NEAREST))
@@ -3529,9 +3753,7 @@ def levers(self, blockid, data):
         # paste it twice with different brightness to make a fake 3D effect
         alpha_over(img, base, (12,-1), base)
 
-        alpha = base.split()[3]
-        base = ImageEnhance.Brightness(base).enhance(0.9)
-        base.putalpha(alpha)
+        base = self.darken(base, 0.9)
         
         alpha_over(img, base, (11,0), base)
 
@@ -3549,9 +3771,7 @@ def levers(self, blockid, data):
         base = base.transpose(Image.FLIP_LEFT_RIGHT)
         alpha_over(img, base, (0,-1), base)
 
-        alpha = base.split()[3]
-        base = ImageEnhance.Brightness(base).enhance(0.9)
-        base.putalpha(alpha)
+        base = self.darken(base, 0.9)
         
         alpha_over(img, base, (1,0), base)
         
@@ -3573,9 +3793,7 @@ def levers(self, blockid, data):
         # lever base, fake 3d again
         base = self.transform_image_top(t_base)
 
-        alpha = base.split()[3]
-        tmp = ImageEnhance.Brightness(base).enhance(0.8)
-        tmp.putalpha(alpha)
+        tmp = self.darken(base, 0.8)
         
         alpha_over(img, tmp, (0,12), tmp)
         alpha_over(img, base, (0,11), base)
@@ -3591,9 +3809,7 @@ def levers(self, blockid, data):
         # lever base, fake 3d again
         base = self.transform_image_top(t_base.rotate(90))
 
-        alpha = base.split()[3]
-        tmp = ImageEnhance.Brightness(base).enhance(0.8)
-        tmp.putalpha(alpha)
+        tmp = self.darken(base, 0.8)
         
         alpha_over(img, tmp, (0,12), tmp)
         alpha_over(img, base, (0,11), base)
@@ -3636,9 +3852,7 @@ def pressure_plate(self, blockid, data):
     
     top = self.transform_image_top(t)
     
-    alpha = top.split()[3]
-    topd = ImageEnhance.Brightness(top).enhance(0.8)
-    topd.putalpha(alpha)
+    topd = self.darken(top, 0.8)
     
     #show it 3d or 2d if unpressed or pressed
     if data == 0:
@@ -3715,9 +3929,7 @@ def buttons(self, blockid, data):
             # paste it twice with different brightness to make a 3D effect
             alpha_over(img, button, (12,-1), button)
 
-            alpha = button.split()[3]
-            button = ImageEnhance.Brightness(button).enhance(0.9)
-            button.putalpha(alpha)
+            button = self.darken(button, 0.9)
 
             alpha_over(img, button, (11,0), button)
 
@@ -3726,9 +3938,7 @@ def buttons(self, blockid, data):
             button = button.transpose(Image.FLIP_LEFT_RIGHT)
             alpha_over(img, button, (0,-1), button)
 
-            alpha = button.split()[3]
-            button = ImageEnhance.Brightness(button).enhance(0.9)
-            button.putalpha(alpha)
+            button = self.darken(button, 0.9)
 
             alpha_over(img, button, (1,0), button)
 
@@ -3746,9 +3956,7 @@ def buttons(self, blockid, data):
         # paste it twice with different brightness to make a 3D effect
         alpha_over(img, button, (0,12), button)
 
-        alpha = button.split()[3]
-        button = ImageEnhance.Brightness(button).enhance(0.9)
-        button.putalpha(alpha)
+        button = self.darken(button, 0.9)
 
         alpha_over(img, button, (0,11), button)
 
@@ -3847,15 +4055,7 @@ def snow(self, blockid, data):
     img = Image.new("RGBA", (24,24), self.bgcolor)
 
     top = self.transform_image_top(tex)
-    side = self.transform_image_side(sidetex)
-    otherside = side.transpose(Image.FLIP_LEFT_RIGHT)
-
-    sidealpha = side.split()[3]
-    side = ImageEnhance.Brightness(side).enhance(0.9)
-    side.putalpha(sidealpha)
-    othersidealpha = otherside.split()[3]
-    otherside = ImageEnhance.Brightness(otherside).enhance(0.8)
-    otherside.putalpha(othersidealpha)
+    side, otherside = self.build_sides(sidetex)
 
     alpha_over(img, side, (0, 6), side)
     alpha_over(img, otherside, (12, 6), otherside)
@@ -3872,15 +4072,7 @@ def cactus(self, blockid, data):
     img = Image.new("RGBA", (24,24), self.bgcolor)
     
     top = self.transform_image_top(top)
-    side = self.transform_image_side(side)
-    otherside = side.transpose(Image.FLIP_LEFT_RIGHT)
-
-    sidealpha = side.split()[3]
-    side = ImageEnhance.Brightness(side).enhance(0.9)
-    side.putalpha(sidealpha)
-    othersidealpha = otherside.split()[3]
-    otherside = ImageEnhance.Brightness(otherside).enhance(0.8)
-    otherside.putalpha(othersidealpha)
+    side, otherside = self.build_sides(side)
 
     alpha_over(img, side, (1,6), side)
     alpha_over(img, otherside, (11,6), otherside)
@@ -3953,15 +4145,10 @@ def fence(self, blockid, data):
     fence_other_side = fence_side.transpose(Image.FLIP_LEFT_RIGHT)
     fence_top = self.transform_image_top(fence_top)
 
-    # Darken the sides slightly. These methods also affect the alpha layer,
-    # so save them first (we don't want to "darken" the alpha layer making
-    # the block transparent)
-    sidealpha = fence_side.split()[3]
-    fence_side = ImageEnhance.Brightness(fence_side).enhance(0.9)
-    fence_side.putalpha(sidealpha)
-    othersidealpha = fence_other_side.split()[3]
-    fence_other_side = ImageEnhance.Brightness(fence_other_side).enhance(0.8)
-    fence_other_side.putalpha(othersidealpha)
+    # Darken the sides slightly, leaving the alpha layer alone (we don't
+    # want to "darken" the alpha layer making the block transparent)
+    fence_side = self.darken(fence_side, 0.9)
+    fence_other_side = self.darken(fence_other_side, 0.8)
 
     # Compose the fence big stick
     fence_big = Image.new("RGBA", (24,24), self.bgcolor)
@@ -3981,15 +4168,10 @@ def fence(self, blockid, data):
     fence_small_side = self.transform_image_side(fence_small_side)
     fence_small_other_side = fence_small_side.transpose(Image.FLIP_LEFT_RIGHT)
     
-    # Darken the sides slightly. These methods also affect the alpha layer,
-    # so save them first (we don't want to "darken" the alpha layer making
-    # the block transparent)
-    sidealpha = fence_small_other_side.split()[3]
-    fence_small_other_side = ImageEnhance.Brightness(fence_small_other_side).enhance(0.9)
-    fence_small_other_side.putalpha(sidealpha)
-    sidealpha = fence_small_side.split()[3]
-    fence_small_side = ImageEnhance.Brightness(fence_small_side).enhance(0.9)
-    fence_small_side.putalpha(sidealpha)
+    # Darken the sides slightly, leaving the alpha layer alone (we don't
+    # want to "darken" the alpha layer making the block transparent)
+    fence_small_other_side = self.darken(fence_small_other_side, 0.9)
+    fence_small_side = self.darken(fence_small_side, 0.9)
 
     # Create img to compose the fence
     img = Image.new("RGBA", (24,24), self.bgcolor)
@@ -4035,14 +4217,14 @@ def fence(self, blockid, data):
 def jack_o_lantern(self, blockid, data):
     # normalize data so it can be used by a generic method
     blockstate = {}
-    blockstate['facing'] = {0:'south', 1:'west', 2:'north', 3:'east'}[data]
+    blockstate['facing'] = ('south', 'west', 'north', 'east')[data]
     return self.build_block_from_model('jack_o_lantern', blockstate)
 
 @material(blockid=11300, data=list(range(4)), solid=True)
 def carved_pumpkin(self, blockid, data):
     # normalize data so it can be used by a generic method
     blockstate = {}
-    blockstate['facing'] = {0:'south', 1:'west', 2:'north', 3:'east'}[data]
+    blockstate['facing'] = ('south', 'west', 'north', 'east')[data]
     return self.build_block_from_model('carved_pumpkin', blockstate)
 
 # nether roof
@@ -4082,16 +4264,7 @@ def cake(self, blockid, data):
     img = Image.new("RGBA", (24, 24), self.bgcolor)
     if data == 0:  # unbitten cake
         top = self.transform_image_top(top)
-        side = self.transform_image_side(side)
-        otherside = side.transpose(Image.FLIP_LEFT_RIGHT)
-
-        # darken sides slightly
-        sidealpha = side.split()[3]
-        side = ImageEnhance.Brightness(side).enhance(0.9)
-        side.putalpha(sidealpha)
-        othersidealpha = otherside.split()[3]
-        otherside = ImageEnhance.Brightness(otherside).enhance(0.8)
-        otherside.putalpha(othersidealpha)
+        side, otherside = self.build_sides(side)
 
         # composite the cake
         alpha_over(img, side, (1, 6), side)
@@ -4122,12 +4295,8 @@ def cake(self, blockid, data):
             # create top side
             t = self.transform_image_top(top)
             # darken sides slightly
-            sidealpha = ls.split()[3]
-            ls = ImageEnhance.Brightness(ls).enhance(0.9)
-            ls.putalpha(sidealpha)
-            othersidealpha = rs.split()[3]
-            rs = ImageEnhance.Brightness(rs).enhance(0.8)
-            rs.putalpha(othersidealpha)
+            ls = self.darken(ls, 0.9)
+            rs = self.darken(rs, 0.8)
             # compose the cake
             alpha_over(img, rs, (12, 6), rs)
             alpha_over(img, ls, (1 + deltax, 6 + deltay), ls)
@@ -4142,12 +4311,8 @@ def cake(self, blockid, data):
             # create right side
             rs = self.transform_image_side(fullside).transpose(Image.FLIP_LEFT_RIGHT)
             # darken sides slightly
-            sidealpha = ls.split()[3]
-            ls = ImageEnhance.Brightness(ls).enhance(0.9)
-            ls.putalpha(sidealpha)
-            othersidealpha = rs.split()[3]
-            rs = ImageEnhance.Brightness(rs).enhance(0.8)
-            rs.putalpha(othersidealpha)
+            ls = self.darken(ls, 0.9)
+            rs = self.darken(rs, 0.8)
             # compose the cake
             alpha_over(img, ls, (2, 6), ls)
             alpha_over(img, t, (1, 6), t)
@@ -4163,12 +4328,8 @@ def cake(self, blockid, data):
             rs = self.transform_image_side(side.transpose(Image.FLIP_LEFT_RIGHT))
             rs = rs.transpose(Image.FLIP_LEFT_RIGHT)
             # darken sides slightly
-            sidealpha = ls.split()[3]
-            ls = ImageEnhance.Brightness(ls).enhance(0.9)
-            ls.putalpha(sidealpha)
-            othersidealpha = rs.split()[3]
-            rs = ImageEnhance.Brightness(rs).enhance(0.8)
-            rs.putalpha(othersidealpha)
+            ls = self.darken(ls, 0.9)
+            rs = self.darken(rs, 0.8)
             # compose the cake
             alpha_over(img, ls, (2, 6), ls)
             alpha_over(img, t, (1, 6), t)
@@ -4186,12 +4347,8 @@ def cake(self, blockid, data):
                 deltax += 1
             rs = self.transform_image_side(inside).transpose(Image.FLIP_LEFT_RIGHT)
             # darken sides slightly
-            sidealpha = ls.split()[3]
-            ls = ImageEnhance.Brightness(ls).enhance(0.9)
-            ls.putalpha(sidealpha)
-            othersidealpha = rs.split()[3]
-            rs = ImageEnhance.Brightness(rs).enhance(0.8)
-            rs.putalpha(othersidealpha)
+            ls = self.darken(ls, 0.9)
+            rs = self.darken(rs, 0.8)
             # compose the cake
             alpha_over(img, ls, (2, 6), ls)
             alpha_over(img, t, (1, 6), t)
@@ -4526,6 +4683,15 @@ def huge_mushroom(self, blockid, data):
 # at the moment is not used
 @material(blockid=[101,102, 160], data=list(range(256)), transparent=True, nospawn=True)
 def panes(self, blockid, data):
+    # only stained glass panes have a color, draw the others only once
+    if blockid != 160:
+        data &= 0xf0
+    key = ('panes', blockid, data)
+    if key not in self.material_cache:
+        self.material_cache[key] = draw_panes(self, blockid, data)
+    return self.material_cache[key].copy()
+
+def draw_panes(self, blockid, data):
     # no rotation, uses pseudo data
     if blockid == 101:
         # iron bars
@@ -4711,9 +4877,7 @@ def fence_gate(self, blockid, data):
     gate_side_draw.rectangle((14,0,15,15),outline=(0,0,0,0),fill=(0,0,0,0))
     
     # darken the sides slightly, as with the fences
-    sidealpha = gate_side.split()[3]
-    gate_side = ImageEnhance.Brightness(gate_side).enhance(0.9)
-    gate_side.putalpha(sidealpha)
+    gate_side = self.darken(gate_side, 0.9)
     
     # create the other sides
     mirror_gate_side = self.transform_image_side(gate_side.transpose(Image.FLIP_LEFT_RIGHT))
@@ -4858,7 +5022,7 @@ def end_portal(self, blockid, data):
 # end portal frame (data range 8 to get all orientations of filled)
 @material(blockid=120, data=list(range(8)), transparent=True, solid=True, nospawn=True)
 def end_portal_frame(self, blockid, data):
-    facing = {2: 'north', 0: 'south', 1: 'west', 3: 'east'}[data % 4]
+    facing = ('south', 'west', 'north', 'east')[data % 4]
     if data & 0x4 == 0x4:
         return self.build_block_from_model('end_portal_frame_filled', {'facing': facing})
     return self.build_block_from_model('end_portal_frame', {'facing': facing})
@@ -4878,30 +5042,16 @@ def daylight_sensor(self, blockid, data):
         return self.build_block_from_model('daylight_detector_inverted')
 
 
+# the planks wooden slabs are made of, by the low three data bits
+wooden_slab_woods = ["oak", "spruce", "birch", "jungle", "acacia", "dark_oak", "crimson", "warped"]
+
 # wooden double and normal slabs
 # these are the new wooden slabs, blockids 43 44 still have wooden
 # slabs, but those are unobtainable without cheating
 @material(blockid=[125, 126], data=list(range(16)), transparent=(44,), solid=True)
 def wooden_slabs(self, blockid, data):
     texture = data & 7
-    if texture== 0: # oak 
-        top = side = self.load_image_texture("assets/minecraft/textures/block/oak_planks.png")
-    elif texture== 1: # spruce
-        top = side = self.load_image_texture("assets/minecraft/textures/block/spruce_planks.png")
-    elif texture== 2: # birch
-        top = side = self.load_image_texture("assets/minecraft/textures/block/birch_planks.png")
-    elif texture== 3: # jungle
-        top = side = self.load_image_texture("assets/minecraft/textures/block/jungle_planks.png")
-    elif texture== 4: # acacia
-        top = side = self.load_image_texture("assets/minecraft/textures/block/acacia_planks.png")
-    elif texture== 5: # dark wood
-        top = side = self.load_image_texture("assets/minecraft/textures/block/dark_oak_planks.png")
-    elif texture== 6: # crimson
-        top = side = self.load_image_texture("assets/minecraft/textures/block/crimson_planks.png")
-    elif texture== 7: # warped
-        top = side = self.load_image_texture("assets/minecraft/textures/block/warped_planks.png")
-    else:
-        return None
+    top = side = self.load_image_texture("assets/minecraft/textures/block/%s_planks.png" % wooden_slab_woods[texture])
     
     if blockid == 125: # double slab
         return self.build_block(top, side)
@@ -5046,15 +5196,10 @@ def cobblestone_wall(self, blockid, data):
     wall_pole_other_side = wall_pole_side.transpose(Image.FLIP_LEFT_RIGHT)
     wall_pole_top = self.transform_image_top(wall_pole_top)
 
-    # Darken the sides slightly. These methods also affect the alpha layer,
-    # so save them first (we don't want to "darken" the alpha layer making
-    # the block transparent)
-    sidealpha = wall_pole_side.split()[3]
-    wall_pole_side = ImageEnhance.Brightness(wall_pole_side).enhance(0.8)
-    wall_pole_side.putalpha(sidealpha)
-    othersidealpha = wall_pole_other_side.split()[3]
-    wall_pole_other_side = ImageEnhance.Brightness(wall_pole_other_side).enhance(0.7)
-    wall_pole_other_side.putalpha(othersidealpha)
+    # Darken the sides slightly, leaving the alpha layer alone (we don't
+    # want to "darken" the alpha layer making the block transparent)
+    wall_pole_side = self.darken(wall_pole_side, 0.8)
+    wall_pole_other_side = self.darken(wall_pole_other_side, 0.7)
 
     # Compose the wall pole
     wall_pole = Image.new("RGBA", (24,24), self.bgcolor)
@@ -5078,12 +5223,9 @@ def cobblestone_wall(self, blockid, data):
     wall_side = self.transform_image_side(wall_side)
     wall_side_top = self.transform_image_top(wall_side_top)
 
-    # Darken the sides slightly. These methods also affect the alpha layer,
-    # so save them first (we don't want to "darken" the alpha layer making
-    # the block transparent)
-    sidealpha = wall_side.split()[3]
-    wall_side = ImageEnhance.Brightness(wall_side).enhance(0.7)
-    wall_side.putalpha(sidealpha)
+    # Darken the sides slightly, leaving the alpha layer alone (we don't
+    # want to "darken" the alpha layer making the block transparent)
+    wall_side = self.darken(wall_side, 0.7)
 
     alpha_over(tmp,wall_side, (0,0),wall_side)
     alpha_over(tmp,wall_side_top, (-5,3),wall_side_top)
@@ -5095,12 +5237,9 @@ def cobblestone_wall(self, blockid, data):
     wall_side_full = self.transform_image_side(wall_side_full)
     wall_side_top_full = self.transform_image_top(wall_side_top_full.rotate(90))
 
-    # Darken the sides slightly. These methods also affect the alpha layer,
-    # so save them first (we don't want to "darken" the alpha layer making
-    # the block transparent)
-    sidealpha = wall_side_full.split()[3]
-    wall_side_full = ImageEnhance.Brightness(wall_side_full).enhance(0.7)
-    wall_side_full.putalpha(sidealpha)
+    # Darken the sides slightly, leaving the alpha layer alone (we don't
+    # want to "darken" the alpha layer making the block transparent)
+    wall_side_full = self.darken(wall_side_full, 0.7)
 
     alpha_over(tmp,wall_side_full, (4,0),wall_side_full)
     alpha_over(tmp,wall_side_top_full, (3,-4),wall_side_top_full)
@@ -5170,7 +5309,7 @@ def crops4(self, blockid, data):
 
 @material(blockid=145, data=list(range(12)), transparent=True, nospawn=True)
 def anvil(self, blockid, data):
-    facing = {2: 'north', 0: 'south', 1: 'west', 3: 'east'}[data % 4]
+    facing = ('south', 'west', 'north', 'east')[data % 4]
     if (data & 0xc) == 0:  # non damaged anvil
         return self.build_block_from_model('anvil', {'facing': facing})
     elif (data & 0xc) == 0x4:  # slightly damaged
@@ -5264,7 +5403,7 @@ def boneblock(self, blockid, data):
 # observer
 @material(blockid=218, data=[0, 1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 13], solid=True, nospawn=True)
 def observer(self, blockid, data):
-    facing = {0: 'down', 1: 'up', 2: 'north', 3: 'south', 4: 'west', 5: 'east'}[data & 0b0111]
+    facing = ('down', 'up', 'north', 'south', 'west', 'east')[data & 0b0111]
     if data & 0b1000:
         return self.build_block_from_model('observer', {'facing': facing})
     else:
@@ -5332,7 +5471,7 @@ def structure_block(self, blockid, data):
 # Jigsaw block
 @material(blockid=256, data=list(range(6)), solid=True)
 def jigsaw_block(self, blockid, data):
-    facing = {0: 'down', 1: 'up', 2: 'north', 3: 'south', 4: 'west', 5: 'east'}[data]
+    facing = ('down', 'up', 'north', 'south', 'west', 'east')[data]
     return self.build_block_from_model('jigsaw', {'facing':facing})
 
 
@@ -5356,7 +5495,7 @@ def crops(self, blockid, data):
 # Glazed Terracotta
 @material(blockid=list(range(235, 251)), data=list(range(4)), solid=True)
 def glazed_terracotta(self, blockid, data):
-    facing = {0: 'south', 1: 'west', 2: 'north', 3: 'east'}[data]
+    facing = ('south', 'west', 'north', 'east')[data]
     return self.build_block_from_model("%s_glazed_terracotta" % color_map[blockid - 235], {'facing': facing})
 
 # scaffolding
@@ -5370,7 +5509,7 @@ def scaffolding(self, blockid, data):
 # beehive and bee_nest
 @material(blockid=[11501, 11502], data=list(range(8)), solid=True)
 def beehivenest(self, blockid, data):    
-    facing = {0: 'south', 1: 'west', 2: 'north', 3: 'east'}[data % 4]
+    facing = ('south', 'west', 'north', 'east')[data % 4]
     if blockid == 11501:
         if data >= 4:
             return self.build_block_from_model('beehive_honey', {'facing': facing})
@@ -5383,7 +5522,7 @@ def beehivenest(self, blockid, data):
 # Barrel
 @material(blockid=11418, data=list(range(12)), solid=True)
 def barrel(self, blockid, data):
-    facing = {0: 'up', 1: 'down', 2: 'south', 3: 'east', 4: 'north', 5: 'west'}[data >> 1]
+    facing = ('up', 'down', 'south', 'east', 'north', 'west')[data >> 1]
 
     if data & 0x01:
         return self.build_block_from_model('barrel_open', {'facing': facing})
@@ -0,0 +1,111 @@
+import io
+import pickle
+import unittest
+
+import numpy
+from PIL import Image, ImageEnhance
+
+from overviewer_core import textures
+
+def png_bytes(img, **params):
+    data = io.BytesIO()
+    img.save(data, "PNG", **params)
+    return data.getvalue()
+
+class DecodePNGTest(unittest.TestCase):
+
+    @unittest.skipUnless(textures.pyspng, "pyspng not installed")
+    def test_rgba(self):
+        img = Image.new("RGBA", (16, 16), (10, 20, 30, 128))
+        img.putpixel((3, 4), (255, 0, 0, 0))
+        data = png_bytes(img)
+        decoded = textures.decode_png(data)
+        expected = Image.open(io.BytesIO(data)).convert("RGBA")
+        self.assertEqual(decoded.mode, "RGBA")
+        self.assertEqual(decoded.tobytes(), expected.tobytes())
+
+    def test_palette_transparency(self):
+        img = Image.new("P", (16, 16), 0)
+        img.putpalette([0, 0, 0, 40, 200, 60] + [0, 0, 0] * 254)
+        img.putpixel((5, 5), 1)
+        data = png_bytes(img, transparency=0)
+        self.assertIn(b'tRNS', data)
+        self.assertIsNone(textures.decode_png(data))
+
+    def test_gray_transparency(self):
+        img = Image.new("L", (16, 16), 0)
+        img.putpixel((5, 5), 200)
+        self.assertIsNone(textures.decode_png(png_bytes(img, transparency=0)))
+
+    def test_rgb_transparency(self):
+        img = Image.new("RGB", (16, 16), (0, 0, 0))
+        img.putpixel((5, 5), (40, 200, 60))
+        self.assertIsNone(textures.decode_png(png_bytes(img, transparency=(0, 0, 0))))
+
+class BrightnessTableTest(unittest.TestCase):
+
+    def test_matches_image_enhance(self):
+        rng = numpy.random.default_rng(0)
+        img = Image.fromarray(rng.integers(0, 256, (16, 16, 4), dtype=numpy.uint8), "RGBA")
+        for factor in (0.7, 0.8, 0.9, 1.2):
+            expected = ImageEnhance.Brightness(img).enhance(factor)
+            expected.putalpha(img.getchannel("A"))
+            result = img.point(textures.brightness_table(factor))
+            self.assertEqual(result.tobytes(), expected.tobytes(), factor)
+
+class CacheByContentsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+        def flip(img):
+            self.calls += 1
+            return img.transpose(Image.FLIP_LEFT_RIGHT)
+        self.flip = textures.cache_by_contents(flip)
+
+    def test_returns_copies(self):
+        img = Image.new("RGBA", (16, 16), (10, 20, 30, 255))
+        img.putpixel((0, 0), (255, 0, 0, 255))
+        first = self.flip(img)
+        expected = first.tobytes()
+        first.putpixel((15, 0), (0, 0, 0, 0))
+        second = self.flip(img.copy())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second.tobytes(), expected)
+        self.assertIsNot(first, second)
+
+    def test_palette_not_cached(self):
+        img = Image.new("P", (16, 16), 0)
+        img.putpalette([0, 0, 0, 40, 200, 60] + [0, 0, 0] * 254)
+        img.putpixel((0, 0), 1)
+        first = self.flip(img)
+        second = self.flip(img)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(first.mode, "P")
+        self.assertEqual(second.tobytes(), img.transpose(Image.FLIP_LEFT_RIGHT).tobytes())
+
+class BlockmapPickleTest(unittest.TestCase):
+
+    @unittest.skipUnless(textures.shared_memory, "multiprocessing.shared_memory not available")
+    def test_pickle_shares_blockmap(self):
+        tex = textures.Textures()
+        tex.blockmap = [None] * textures.max_blockid * textures.max_data
+        keys = list(textures.blockmap_generators)[:3]
+        indices = [blockid * textures.max_data + data for blockid, data in keys]
+        sprites = [Image.new("RGBA", (24, 24), (200, 100, 50, 255)),
+                   Image.new("RGBA", (24, 24), (0, 0, 0, 0)),
+                   Image.new("RGBA", (24, 24), (200, 100, 50, 255))]
+        sprites[1].putpixel((3, 7), (10, 20, 30, 128))
+        for index, img in zip(indices, sprites):
+            tex.blockmap[index] = (img, img.getchannel("A"))
+        tex.pack_blockmap()
+        tex.generated = True
+
+        copy = pickle.loads(pickle.dumps(tex))
+        for index, img in zip(indices, sprites):
+            sprite, mask = copy.blockmap[index]
+            self.assertEqual(sprite.tobytes(), img.tobytes())
+            self.assertEqual(mask.tobytes(), img.getchannel("A").tobytes())
+        self.assertEqual(copy.blockmap.count(None), len(copy.blockmap) - 3)
+
+if __name__ == "__main__":
+    unittest.main()